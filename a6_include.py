@@ -8,6 +8,12 @@
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, batch hashing falls back to pure Python
+    np = None
+
+
 class DynamicArrayException(Exception):
     pass
 
@@ -96,6 +102,86 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# each chunk's padded code matrix holds at most this many code points (16 MB of uint32)
+_BATCH_CELLS = 1 << 22
+
+# longer keys are hashed one at a time, so one outlier cannot widen a whole chunk
+_BATCH_MAX_WIDTH = 256
+_BATCH_CHUNK = _BATCH_CELLS // _BATCH_MAX_WIDTH
+
+
+def _code_matrix(keys: list):
+    """
+    Encode a list of str keys as a (len(keys), longest key) uint32 matrix of code points.
+    Short keys are padded with NUL, which adds 0 to both sample hash functions.
+    """
+    width = max(map(len, keys), default=0)
+    joined = ''.join([key.ljust(width, '\0') for key in keys])
+    codes = np.frombuffer(joined.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    return codes.reshape(len(keys), width)
+
+
+def _batch(keys, scalar_function, vector_function) -> list:
+    """
+    Hash a sequence of keys with vector_function over numpy code matrices, or with
+    scalar_function one key at a time when numpy is missing or a key is not a str.
+    Keys longer than _BATCH_MAX_WIDTH are always hashed with scalar_function, so no matrix
+    holds more than _BATCH_CELLS code points.
+    """
+    keys = list(keys)
+    if np is None or not all(type(key) is str for key in keys):
+        return [scalar_function(key) for key in keys]
+
+    # long keys take an empty row in the matrix and are hashed afterwards
+    long_indices = [index for index, key in enumerate(keys) if len(key) > _BATCH_MAX_WIDTH]
+    short_keys = keys
+    if long_indices:
+        short_keys = [key if len(key) <= _BATCH_MAX_WIDTH else '' for key in keys]
+
+    hashes = []
+    for start in range(0, len(short_keys), _BATCH_CHUNK):
+        codes = _code_matrix(short_keys[start:start + _BATCH_CHUNK])
+        hashes.extend(vector_function(codes).tolist())
+
+    for index in long_indices:
+        hashes[index] = scalar_function(keys[index])
+    return hashes
+
+
+def hash_function_1_batch(keys) -> list:
+    """Return [hash_function_1(key) for key in keys], computed in one vectorized pass"""
+    return _batch(keys, hash_function_1,
+                  lambda codes: codes.sum(axis=1, dtype=np.int64))
+
+
+def hash_function_2_batch(keys) -> list:
+    """Return [hash_function_2(key) for key in keys], computed in one vectorized pass"""
+    def weighted_sum(codes):
+        weights = np.arange(1, codes.shape[1] + 1, dtype=np.int64)
+        return codes.astype(np.int64) @ weights
+
+    return _batch(keys, hash_function_2, weighted_sum)
+
+
+_BATCH_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_batch,
+    hash_function_2: hash_function_2_batch,
+}
+
+
+def batch_hash_function(function):
+    """
+    Return a callable that hashes a sequence of keys into a list of ints with the given
+    hash function, using its vectorized batch version when one exists. The batch versions gain
+    the most on longer keys and on hash_function_2: on short keys the per-key loop of
+    hash_function_1 is already cheap, and building the code matrix costs about as much.
+    """
+    batch_function = _BATCH_HASH_FUNCTIONS.get(function)
+    if batch_function is not None:
+        return batch_function
+    return lambda keys: [function(key) for key in keys]
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +189,19 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # slotted to avoid a per-node __dict__, nodes are the bulk of an SC map's memory
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash_value: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        hash_value caches the full hash of the key so a map never has to recompute it.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash_value
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +213,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,9 +237,12 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, insert_node, detach, remove, contains, promote, length,
+    iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,11 +267,26 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash_value: int = None) -> None:
+        """Insert new node at front of the list, caching the key's hash if given."""
+        self._head = SLNode(key, value, self._head, hash_value)
         self._size += 1
 
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list, without allocating a new one."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def detach(self) -> SLNode:
+        """
+        Empty the list and return its former head. The detached nodes stay linked to each other.
+        """
+        head = self._head
+        self._head = None
+        self._size = 0
+        return head
+
     def remove(self, key: str) -> bool:
         """
         Remove first node with matching key.
@@ -201,6 +315,32 @@ class LinkedList:
             node = node.next
         return node
 
+    def promote(self, key: str, hash_value: int, transpose: bool = False) -> SLNode:
+        """
+        Return node with matching hash and key, or None if no match. A found node is moved to the
+        front of the list, or with transpose swapped with the node before it.
+        """
+        before, previous, node = None, None, self._head
+        while node:
+
+            if node.hash == hash_value and node.key == key:
+                if previous:
+                    # unlink the node, then relink it at the front or in front of previous
+                    previous.next = node.next
+                    if transpose:
+                        node.next = previous
+                        if before:
+                            before.next = node
+                        else:
+                            self._head = node
+                    else:
+                        node.next = self._head
+                        self._head = node
+                return node
+
+            before, previous, node = previous, node, node.next
+        return None
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
@@ -210,10 +350,17 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # slotted to avoid a per-entry __dict__, entries are the bulk of an OA map's memory
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash_value: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        hash_value caches the full hash of the key so a map never has to recompute it.
+        """
         self.key = key
         self.value = value
+        self.hash = hash_value
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -221,3 +368,20 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import random
+
+    print("\nBatch hashing - identical to the scalar functions")
+    print("-------------------------------------------------")
+    rnd = random.Random(0)
+    keys = ['', 'a', 'key1', 'listen', 'silent', 'caf\u00e9', '\U0001f600', 'x' * _BATCH_MAX_WIDTH,
+            'y' * (_BATCH_MAX_WIDTH + 1), 'z' * 10_000]
+    keys += [''.join(chr(rnd.randint(32, 0x2fff)) for _ in range(rnd.randint(0, 40)))
+             for _ in range(2 * _BATCH_CHUNK + 17)]
+    for scalar, batch in _BATCH_HASH_FUNCTIONS.items():
+        print(scalar.__name__, batch(keys) == [scalar(key) for key in keys],
+              batch(keys[:10]) == [scalar(key) for key in keys[:10]], batch([]) == [])
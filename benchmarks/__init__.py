@@ -0,0 +1,3 @@
+# Description: Performance benchmarks for the SC and OA HashMap implementations.
+#              Run each benchmark from the repository root as a module, e.g.
+#              python -m benchmarks.bench_oa_miss
@@ -0,0 +1,74 @@
+# Description: Throughput of ConcurrentHashMap against a plain SC HashMap
+#              behind one global lock, as the number of threads grows. On a
+#              GIL build the threads still take turns running Python code, so
+#              expect scaling only on free-threaded (no-GIL) CPython.
+
+import argparse
+import sys
+import threading
+import time
+
+from hash_map_concurrent import ConcurrentHashMap
+from hash_map_sc import HashMap
+from benchmarks.common import print_table
+
+
+class GlobalLockMap:
+    """The baseline: every call on a shared HashMap wrapped in one lock."""
+
+    def __init__(self) -> None:
+        self._map = HashMap(11, hash)
+        self._lock = threading.Lock()
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._map.put(key, value)
+
+    def get(self, key):
+        with self._lock:
+            return self._map.get(key)
+
+    def remove(self, key) -> None:
+        with self._lock:
+            self._map.remove(key)
+
+
+def worker(m, thread_id: int, operations: int) -> None:
+    """Run a put / get / get / remove mix over keys private to this thread."""
+    prefix = 't' + str(thread_id) + '-'
+    for i in range(operations // 4):
+        key = prefix + str(i % 2000)
+        m.put(key, i)
+        m.get(key)
+        m.get(prefix + 'missing')
+        m.remove(key)
+
+
+def throughput(m, threads: int, operations: int) -> float:
+    """Return operations per second for threads workers sharing the map."""
+    workers = [threading.Thread(target=worker, args=(m, n, operations)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Concurrent map throughput vs thread count')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--operations', type=int, default=100_000, help='operations per thread')
+    parser.add_argument('--stripes', type=int, default=16)
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('GIL enabled:', gil)
+
+    rows = []
+    for threads in args.threads:
+        striped = throughput(ConcurrentHashMap(11, hash, stripes=args.stripes), threads, args.operations)
+        single = throughput(GlobalLockMap(), threads, args.operations)
+        rows.append((threads, round(single), round(striped)))
+
+    print_table(['threads', 'global lock ops/s', 'striped ops/s'], rows)
@@ -0,0 +1,45 @@
+# Description: Scaling of find_mode_parallel as the number of worker processes
+#              grows from 1 to the CPU count, with the single-process
+#              find_mode as the baseline. Each worker counts a chunk of the
+#              input in its own HashMap, so the speedup is bounded by the
+#              pickling of chunks and the final merge of partial counts.
+
+import argparse
+import os
+
+from a6_include import DynamicArray
+from hash_map_sc import find_mode, find_mode_parallel
+from benchmarks.common import best_of, print_table, zipfian_keys
+
+
+def run(count: int, vocabulary: int, workers: list, repeat: int) -> list:
+    """Return (workers, seconds, speedup) rows, with find_mode as the 'serial' row."""
+    keys = zipfian_keys(count, vocabulary=vocabulary)
+    keys_array = DynamicArray(keys)
+
+    expected = find_mode(keys_array)[1]
+    serial = best_of(lambda: find_mode(keys_array), repeat)
+    rows = [('serial', round(serial, 3), 1.0)]
+
+    for count_workers in workers:
+        mode, frequency = find_mode_parallel(keys, workers=count_workers)
+        assert frequency == expected
+
+        seconds = best_of(lambda: find_mode_parallel(keys, workers=count_workers), repeat)
+        rows.append((count_workers, round(seconds, 3), round(serial / seconds, 2)))
+
+    return rows
+
+
+if __name__ == "__main__":
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description='find_mode_parallel scaling vs worker count')
+    parser.add_argument('--count', type=int, default=500_000, help='keys in the input array')
+    parser.add_argument('--vocabulary', type=int, default=50_000, help='distinct keys to draw from')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, *range(2, cpus + 1, 2), cpus}))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('CPUs:', cpus)
+    print_table(['workers', 'seconds', 'speedup'], run(args.count, args.vocabulary, args.workers, args.repeat))
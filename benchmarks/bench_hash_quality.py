@@ -0,0 +1,51 @@
+# Description: Distribution report for every hash function in hash_functions
+#              over the benchmark key distributions: bucket occupancy,
+#              chi-square uniformity, longest chain, expected probe lengths
+#              and hashing speed, to choose a function from measured data.
+#
+#              python -m benchmarks.bench_hash_quality --count 20000 --load 0.5
+
+import argparse
+
+from capacity import next_prime
+from hash_functions import FUNCTIONS, compare
+from benchmarks.common import anagram_keys, print_table, random_keys, sequential_keys
+
+DISTRIBUTIONS = {
+    'sequential': sequential_keys,
+    'anagram': anagram_keys,
+    'uniform': random_keys,
+}
+
+
+def rows_for(report: dict) -> list:
+    """Turn a {function name: analyze report} dictionary into table rows."""
+    rows = []
+    for name, result in report.items():
+        oa = result['oa_probe_length']
+        rows.append((name,
+                     round(result['ns_per_key']),
+                     round(result['distinct_hashes'], 3),
+                     f"{result['occupancy']:.3f}/{result['expected_occupancy']:.3f}",
+                     round(result['chi_square_ratio'], 2),
+                     result['max_chain_length'],
+                     round(result['sc_probe_length'], 2),
+                     '-' if oa is None else round(oa, 2)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Hash function distribution quality')
+    parser.add_argument('--count', type=int, default=20_000, help='distinct keys per distribution')
+    parser.add_argument('--load', type=float, default=0.5, help='keys per bucket, sets the capacity')
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    args = parser.parse_args()
+
+    capacity = next_prime(int(args.count / args.load))
+    headers = ['function', 'ns/key', 'distinct', 'occupancy/expected', 'chi2/df', 'max chain',
+               'SC probes', 'OA probes']
+
+    for distribution in args.distributions:
+        keys = DISTRIBUTIONS[distribution](args.count)
+        print(f"\n{distribution} keys: {len(keys)}, capacity: {capacity}")
+        print_table(headers, rows_for(compare(keys, capacity, FUNCTIONS)))
@@ -0,0 +1,23 @@
+# Description: Report the memory each open addressing storage layout spends per
+#              entry. Keys are created before tracing starts, so the figure is
+#              the table itself: slots, entry objects and the arrays holding them.
+
+import argparse
+
+from hash_map_oa import HashMap
+from hash_map_oa_compact import CompactHashMap
+from benchmarks.common import bytes_per_entry, print_table, sequential_keys
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='OA HashMap memory per entry by storage layout')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000])
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        keys = sequential_keys(size)
+        for cls in (HashMap, CompactHashMap):
+            rows.append((size, cls.__name__, round(bytes_per_entry(cls, keys), 1)))
+
+    print_table(['keys', 'storage', 'bytes/entry'], rows)
@@ -0,0 +1,49 @@
+# Description: Measure the cost of a lookup miss in the open addressing HashMap
+#              as capacity grows while the load factor is held fixed. With the
+#              stop-at-empty probing engine the per-miss time should stay flat.
+#              The builtin hash is used by default because hash_function_1 and
+#              hash_function_2 map short keys into a narrow range, so their probe
+#              length grows with the key count regardless of the probing engine.
+
+import argparse
+
+from a6_include import hash_function_1, hash_function_2
+from hash_map_oa import HashMap
+from benchmarks.common import best_of, print_table, sequential_keys
+
+
+FUNCTIONS = {'builtin': hash, 'hash_function_1': hash_function_1, 'hash_function_2': hash_function_2}
+
+
+def run(capacities: list, load: float, lookups: int, function=hash) -> list:
+    """Return (capacity, size, microseconds per miss) for each capacity."""
+    rows = []
+    for capacity in capacities:
+        m = HashMap(capacity, function)
+        size = int(m.get_capacity() * load)
+        for key in sequential_keys(size):
+            m.put(key, None)
+
+        misses = sequential_keys(lookups, prefix='miss')
+
+        def lookup():
+            for key in misses:
+                m.get(key)
+                m.contains_key(key)
+
+        seconds = best_of(lookup, repeat=3)
+        rows.append((m.get_capacity(), m.get_size(), round(seconds / (2 * lookups) * 1e6, 3)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='OA HashMap lookup-miss latency vs capacity')
+    parser.add_argument('--load', type=float, default=0.4)
+    parser.add_argument('--function', choices=sorted(FUNCTIONS), default='builtin')
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--capacities', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000, 400_000])
+    args = parser.parse_args()
+
+    rows = run(args.capacities, args.load, args.lookups, FUNCTIONS[args.function])
+    print_table(['capacity', 'size', 'us/miss'], rows)
@@ -0,0 +1,67 @@
+# Description: Startup cost of a large lookup table: building a hash_map_oa
+#              HashMap with put_many at every start, against opening a
+#              MappedHashMap file that was built once. Each row also times a
+#              batch of lookups, so the cost of reading through the mapping
+#              is visible next to the startup saving. hash_function_1 / 2 only
+#              spread keys over a few thousand hashes, so a table this large
+#              uses crc32, which is also stable across processes as a mapped
+#              file requires.
+
+import argparse
+import os
+import tempfile
+import time
+
+from hash_map_oa import HashMap
+from hash_map_oa_mmap import MappedHashMap
+from benchmarks.common import crc32_hash, print_table, random_keys, sequential_keys
+
+
+def timed(function) -> tuple[float, object]:
+    """Return (seconds, result) of one call."""
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def lookups(m, keys: list) -> None:
+    """Look every key up once."""
+    for key in keys:
+        m.get(key)
+
+
+def run(size: int, lookup_count: int) -> list:
+    """Return (map, startup seconds, lookup seconds) rows for one table size."""
+    keys = sequential_keys(size)
+    pairs = [(key, index) for index, key in enumerate(keys)]
+    probes = random_keys(lookup_count) + keys[:lookup_count]
+
+    def build():
+        m = HashMap(11, crc32_hash)
+        m.put_many(pairs)
+        return m
+
+    build_seconds, built = timed(build)
+    rows = [('HashMap put_many', round(build_seconds, 3), round(timed(lambda: lookups(built, probes))[0], 3))]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table.hmap')
+        with MappedHashMap(path, crc32_hash, 2 * size) as m:
+            m.put_many(pairs)
+            m.flush()
+
+        open_seconds, mapped = timed(lambda: MappedHashMap(path, crc32_hash))
+        rows.append(('MappedHashMap open', round(open_seconds, 6),
+                     round(timed(lambda: lookups(mapped, probes))[0], 3)))
+        mapped.close()
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Startup time: rebuild with put_many vs open a mapped file')
+    parser.add_argument('--size', type=int, default=1_000_000, help='keys in the table')
+    parser.add_argument('--lookups', type=int, default=100_000, help='hits and misses timed after startup')
+    args = parser.parse_args()
+
+    print_table(['map', 'startup seconds', 'lookup seconds'], run(args.size, args.lookups))
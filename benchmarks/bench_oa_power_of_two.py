@@ -0,0 +1,83 @@
+# Description: Compare the prime-capacity quadratic probing HashMap against
+#              PowerOfTwoHashMap, which masks a mixed hash instead of taking a
+#              modulo and probes with triangular steps. Reports put, get hit
+#              and get miss time per operation and the mean and longest probe
+#              of the finished table, for each key distribution and hash
+#              function. hash_function_2 is included to show that the mixing
+#              step keeps a weak hash usable in a power-of-two table.
+#
+#              python -m benchmarks.bench_oa_power_of_two --count 20000
+
+import argparse
+
+from a6_include import hash_function_2
+from hash_functions import mix64_hash
+from hash_map_oa import HashMap, PowerOfTwoHashMap
+from benchmarks.common import best_of, crc32_hash, print_table, random_keys, sequential_keys
+
+FUNCTIONS = {'crc32_hash': crc32_hash, 'mix64_hash': mix64_hash, 'hash_function_2': hash_function_2}
+
+DISTRIBUTIONS = {
+    'sequential': sequential_keys,
+    'uniform': random_keys,
+}
+
+
+def mean_probe(m: HashMap) -> float:
+    """Return the mean probe length over the live entries of a map."""
+    histogram = m.get_stats()['probe_length_histogram']
+    total = sum(histogram.values())
+    return sum(length * count for length, count in histogram.items()) / total if total else 0.0
+
+
+def run(count: int, functions: list, distributions: list, repeat: int = 3) -> list:
+    """
+    Return (distribution, function, scheme, capacity, put ns, hit ns, miss ns, mean probe,
+    max probe) rows.
+    """
+    rows = []
+    for distribution in distributions:
+        keys = DISTRIBUTIONS[distribution](count)
+        misses = sequential_keys(count, prefix='miss')
+
+        for function_name in functions:
+            function = FUNCTIONS[function_name]
+
+            for name, cls in (('prime', HashMap), ('power_of_two', PowerOfTwoHashMap)):
+                def build():
+                    m = cls(11, function)
+                    for key in keys:
+                        m.put(key, None)
+                    return m
+
+                m = build()
+
+                def hits():
+                    for key in keys:
+                        m.get(key)
+
+                def miss():
+                    for key in misses:
+                        m.get(key)
+
+                rows.append((distribution, function_name, name, m.get_capacity(),
+                             round(best_of(build, repeat) / count * 1e9),
+                             round(best_of(hits, repeat) / count * 1e9),
+                             round(best_of(miss, repeat) / count * 1e9),
+                             round(mean_probe(m), 2),
+                             m.get_stats()['max_probe_length']))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Prime quadratic vs power-of-two triangular probing')
+    parser.add_argument('--count', type=int, default=20_000)
+    parser.add_argument('--functions', nargs='+', choices=sorted(FUNCTIONS), default=sorted(FUNCTIONS))
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS),
+                        default=sorted(DISTRIBUTIONS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = run(args.count, args.functions, args.distributions, args.repeat)
+    print_table(['keys', 'function', 'scheme', 'capacity', 'put ns', 'hit ns', 'miss ns',
+                 'mean', 'max'], rows)
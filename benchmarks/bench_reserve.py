@@ -0,0 +1,68 @@
+# Description: Bulk-build time of each map filled with put one key at a time,
+#              starting from capacity 11 and growing as it goes, against the
+#              same build into a map made with with_expected_size, which never
+#              resizes. The resizes column counts the resize_table passes the
+#              build made.
+#
+#              python -m benchmarks.bench_reserve --counts 10000 100000
+
+import argparse
+
+from hash_map_oa import HashMap as OpenAddressingMap
+from hash_map_oa_compact import CompactHashMap
+from hash_map_sc import HashMap as SeparateChainingMap
+from benchmarks.common import best_of, crc32_hash, print_table, sequential_keys
+
+MAPS = {
+    'sc': SeparateChainingMap,
+    'oa': OpenAddressingMap,
+    'compact': CompactHashMap,
+}
+
+
+def build(make, keys: list):
+    """Return a map from make() filled with every key by put."""
+    m = make()
+    for key in keys:
+        m.put(key, None)
+    return m
+
+
+def resize_count(make, keys: list) -> int:
+    """Return how many resizes one build makes."""
+    m = make()
+    m.enable_stats()
+    for key in keys:
+        m.put(key, None)
+    return m.get_stats()['resize_count']
+
+
+def run(counts: list, maps: list, repeat: int = 3) -> list:
+    """Return (map, keys, mode, resizes, seconds, speedup) rows."""
+    rows = []
+    for count in counts:
+        keys = sequential_keys(count)
+
+        for name in maps:
+            cls = MAPS[name]
+            modes = (('grown', lambda: cls(11, crc32_hash)),
+                     ('reserved', lambda: cls.with_expected_size(count, crc32_hash)))
+
+            baseline = None
+            for mode, make in modes:
+                seconds = best_of(lambda: build(make, keys), repeat)
+                baseline = baseline or seconds
+                rows.append((name, count, mode, resize_count(make, keys), round(seconds, 3),
+                             round(baseline / seconds, 2)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Bulk-build time with and without reserved capacity')
+    parser.add_argument('--counts', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--maps', nargs='+', choices=sorted(MAPS), default=list(MAPS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_table(['map', 'keys', 'mode', 'resizes', 'seconds', 'speedup'],
+                run(args.counts, args.maps, args.repeat))
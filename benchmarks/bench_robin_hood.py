@@ -0,0 +1,59 @@
+# Description: Compare probe lengths of the quadratic probing HashMap against
+#              RobinHoodHashMap at load factors 0.5 through 0.9. Tables are
+#              filled past the usual 0.5 resize point by inserting through
+#              _insert, which skips the load factor check. Quadratic probing
+#              only reaches half of a prime table, so inserts it cannot place
+#              are reported in the "failed" column.
+#              Robin Hood tightens the max probe length when the hash spreads
+#              keys over the whole table (--function builtin). hash_function_1
+#              and hash_function_2 map keys into a narrow range of home slots,
+#              and linear probing then builds one long cluster, so run the
+#              benchmark with the function you plan to use.
+
+import argparse
+
+from a6_include import DynamicArrayException, hash_function_1, hash_function_2
+from hash_map_oa import HashMap, RobinHoodHashMap
+from benchmarks.common import print_table, random_keys
+
+FUNCTIONS = {'builtin': hash, 'hash_function_1': hash_function_1, 'hash_function_2': hash_function_2}
+
+
+def probe_lengths(m: HashMap) -> list:
+    """Return the probe length of every live entry in the map."""
+    lengths = []
+    for index in range(m.get_capacity()):
+        entry = m._buckets[index]
+        if entry is not None and not entry.is_tombstone:
+            lengths.append(m._probe_length(index))
+    return lengths
+
+
+def run(capacity: int, loads: list, function) -> list:
+    """Return (load, scheme, mean probes, max probes, failed inserts) rows."""
+    rows = []
+    for load in loads:
+        for name, cls in (('quadratic', HashMap), ('robin_hood', RobinHoodHashMap)):
+            m = cls(capacity, function)
+            keys = random_keys(int(m.get_capacity() * load))
+            failed = 0
+            for key in keys:
+                try:
+                    m._insert(key, None, function(key))
+                except DynamicArrayException:
+                    failed += 1
+
+            lengths = probe_lengths(m)
+            rows.append((load, name, round(sum(lengths) / len(lengths), 2), max(lengths), failed))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Quadratic vs Robin Hood probe lengths')
+    parser.add_argument('--capacity', type=int, default=10_007)
+    parser.add_argument('--function', choices=sorted(FUNCTIONS), default='builtin')
+    parser.add_argument('--loads', type=float, nargs='+', default=[0.5, 0.6, 0.7, 0.8, 0.9])
+    args = parser.parse_args()
+
+    rows = run(args.capacity, args.loads, FUNCTIONS[args.function])
+    print_table(['load', 'scheme', 'mean', 'max', 'failed'], rows)
@@ -0,0 +1,52 @@
+# Description: Per-put latency of the separate chaining HashMap with
+#              synchronous resizing against incremental resizing. The worst
+#              put of a synchronous map pays for a whole rehash; with
+#              rehash_step > 0 it should stay close to an ordinary put.
+#              The cyclic garbage collector is paused while timing, as timeit
+#              does, so its own pauses do not hide the resize stalls.
+
+import argparse
+import gc
+import time
+
+from hash_map_sc import HashMap
+from benchmarks.common import print_table, sequential_keys
+
+
+def put_latencies(m: HashMap, keys: list) -> list:
+    """Put every key into the map and return each put's wall time in seconds."""
+    clock = time.perf_counter
+    latencies = []
+    gc.disable()
+    try:
+        for key in keys:
+            start = clock()
+            m.put(key, None)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    return latencies
+
+
+def run(count: int, steps: list) -> list:
+    """Return (mode, total ms, p99 us, p99.9 us, max ms) rows."""
+    keys = sequential_keys(count)
+    rows = []
+    for step in steps:
+        latencies = sorted(put_latencies(HashMap(11, hash, rehash_step=step), keys))
+        mode = 'synchronous' if step == 0 else 'step=' + str(step)
+        rows.append((mode,
+                     round(sum(latencies) * 1e3, 1),
+                     round(latencies[int(len(latencies) * 0.99)] * 1e6, 2),
+                     round(latencies[int(len(latencies) * 0.999)] * 1e6, 2),
+                     round(latencies[-1] * 1e3, 3)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='SC HashMap put latency, synchronous vs incremental resize')
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--steps', type=int, nargs='+', default=[0, 4, 16])
+    args = parser.parse_args()
+
+    print_table(['mode', 'total ms', 'p99 us', 'p99.9 us', 'max ms'], run(args.count, args.steps))
@@ -0,0 +1,82 @@
+# Description: Average key comparisons per get in the separate chaining HashMap
+#              under a Zipfian lookup stream, with plain chains and with the
+#              move_to_front and transpose self-organizing modes. Keys are
+#              inserted from hottest to coldest, and insert puts new keys at
+#              the front of a chain, so without reordering the hot keys sit at
+#              the back of their chains. hash_function_1 gives long chains
+#              because it sums character codes. The comparisons of a lookup
+#              are the 1-based position of the key in its chain.
+#
+#              python -m benchmarks.bench_sc_self_organizing --lookups 200000
+
+import argparse
+import random
+
+from a6_include import hash_function_1, hash_function_2
+from hash_map_sc import HashMap
+from benchmarks.common import crc32_hash, print_table, random_keys, time_with_setup
+
+FUNCTIONS = {'hash_function_1': hash_function_1, 'hash_function_2': hash_function_2,
+             'crc32_hash': crc32_hash}
+
+MODES = (None, 'move_to_front', 'transpose')
+
+
+def build(words: list, function, mode: str) -> HashMap:
+    """Return a map of every word, inserted from the first (hottest) to the last."""
+    m = HashMap.with_expected_size(len(words), function, self_organizing=mode)
+    for word in words:
+        m.put(word, None)
+    return m
+
+
+def comparisons(m: HashMap, key: str) -> int:
+    """Return how many nodes a lookup of key compares, read off the chain before the lookup."""
+    hash_value = m._hash_function(key)
+    for position, node in enumerate(m._buckets[hash_value % m.get_capacity()], 1):
+        if node.hash == hash_value and node.key == key:
+            return position
+    return 0
+
+
+def run(vocabulary: int, lookups: int, exponent: float, function_names: list, repeat: int) -> list:
+    """Return (function, mode, mean comparisons, ns per get, speedup) rows."""
+    words = random_keys(vocabulary)
+    weights = [1 / rank ** exponent for rank in range(1, vocabulary + 1)]
+    stream = random.Random(1).choices(words, weights, k=lookups)
+
+    rows = []
+    for function_name in function_names:
+        function = FUNCTIONS[function_name]
+        baseline = None
+
+        for mode in MODES:
+            m = build(words, function, mode)
+            total = 0
+            for key in stream:
+                total += comparisons(m, key)
+                m.get(key)
+
+            def lookup(fresh: HashMap) -> None:
+                for key in stream:
+                    fresh.get(key)
+
+            seconds = time_with_setup(lambda: build(words, function, mode), lookup, repeat)
+            baseline = baseline or seconds
+            rows.append((function_name, mode or 'plain', round(total / lookups, 2),
+                         round(seconds / lookups * 1e9), round(baseline / seconds, 2)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Self-organizing chains under Zipfian lookups')
+    parser.add_argument('--vocabulary', type=int, default=5_000)
+    parser.add_argument('--lookups', type=int, default=200_000)
+    parser.add_argument('--exponent', type=float, default=1.1, help='Zipf exponent of the lookups')
+    parser.add_argument('--functions', nargs='+', choices=sorted(FUNCTIONS),
+                        default=['hash_function_1', 'crc32_hash'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print_table(['function', 'mode', 'compares', 'ns/get', 'speedup'],
+                run(args.vocabulary, args.lookups, args.exponent, args.functions, args.repeat))
@@ -0,0 +1,62 @@
+# Description: Report bytes per entry for the SC and OA HashMaps with the
+#              slotted node classes from a6_include ("after") and with
+#              equivalent __dict__-based classes swapped in ("before").
+#              Keys are created before tracing starts, so the figure covers
+#              the table, its buckets and the node or entry objects.
+
+import argparse
+import contextlib
+
+import a6_include
+import hash_map_oa
+import hash_map_sc
+from benchmarks.common import bytes_per_entry, print_table, sequential_keys
+
+
+def unslotted(cls) -> type:
+    """Return a copy of a slotted class that stores its attributes in a __dict__ instead."""
+    namespace = {name: attribute for name, attribute in vars(cls).items()
+                 if name != '__slots__' and name not in cls.__slots__}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+@contextlib.contextmanager
+def dict_based_nodes():
+    """Temporarily make both maps build __dict__-based nodes, entries and linked lists."""
+    linked_list = unslotted(a6_include.LinkedList)
+    patches = [
+        (a6_include, 'SLNode', unslotted(a6_include.SLNode)),
+        (a6_include, 'LinkedListIterator', unslotted(a6_include.LinkedListIterator)),
+        (a6_include, 'LinkedList', linked_list),
+        (hash_map_sc, 'LinkedList', linked_list),
+        (hash_map_oa, 'HashEntry', unslotted(a6_include.HashEntry)),
+    ]
+    saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    try:
+        for module, name, replacement in patches:
+            setattr(module, name, replacement)
+        yield
+    finally:
+        for module, name, original in saved:
+            setattr(module, name, original)
+
+
+def run(sizes: list) -> list:
+    """Return (keys, map, before, after) rows of bytes per entry."""
+    rows = []
+    for size in sizes:
+        keys = sequential_keys(size)
+        for name, cls in (('SC', hash_map_sc.HashMap), ('OA', hash_map_oa.HashMap)):
+            with dict_based_nodes():
+                before = bytes_per_entry(cls, keys)
+            after = bytes_per_entry(cls, keys)
+            rows.append((size, name, round(before, 1), round(after, 1)))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Bytes per entry with and without __slots__')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    print_table(['keys', 'map', 'before', 'after'], run(args.sizes))
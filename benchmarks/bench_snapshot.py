@@ -0,0 +1,65 @@
+# Description: Restore time of both HashMaps from a save() snapshot, against
+#              rebuilding the map with put_many and against just reading the
+#              snapshot file's bytes, the floor a restore can approach.
+
+import argparse
+import os
+import tempfile
+import time
+
+import hash_map_oa
+import hash_map_oa_compact
+import hash_map_sc
+from benchmarks.common import crc32_hash, print_table, sequential_keys
+
+MAPS = {'SC': hash_map_sc.HashMap, 'OA': hash_map_oa.HashMap, 'OA compact': hash_map_oa_compact.CompactHashMap}
+
+
+def timed(function) -> tuple[float, object]:
+    """Return (seconds, result) of one call."""
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def read_bytes(path: str) -> bytes:
+    """Read a whole file."""
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def run(size: int) -> list:
+    """Return (map, put_many, save, load, file read, MB) rows."""
+    pairs = [(key, index) for index, key in enumerate(sequential_keys(size))]
+    rows = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, cls in MAPS.items():
+            path = os.path.join(directory, name + '.snap')
+
+            def build():
+                m = cls(11, crc32_hash)
+                m.put_many(pairs)
+                return m
+
+            build_seconds, m = timed(build)
+            save_seconds, _ = timed(lambda: m.save(path))
+            del m
+
+            load_seconds, restored = timed(lambda: cls.load(path))
+            assert restored.get_size() == size
+            del restored
+
+            read_seconds, _ = timed(lambda: read_bytes(path))
+            rows.append((name, round(build_seconds, 3), round(save_seconds, 3), round(load_seconds, 3),
+                         round(read_seconds, 3), round(os.path.getsize(path) / 1e6, 1)))
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Snapshot save / load vs rebuilding with put_many')
+    parser.add_argument('--size', type=int, default=1_000_000, help='keys in the map')
+    args = parser.parse_args()
+
+    print_table(['map', 'put_many s', 'save s', 'load s', 'file read s', 'MB'], run(args.size))
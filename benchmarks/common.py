@@ -0,0 +1,100 @@
+# Description: Small helpers shared by the benchmark scripts.
+
+import random
+import time
+import tracemalloc
+import zlib
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def crc32_hash(key: str) -> int:
+    """
+    Deterministic hash of a key's utf-8 bytes that spreads large key sets, unlike hash_function_1 / 2,
+    and stays the same across processes, unlike the built-in hash.
+    """
+    return zlib.crc32(key.encode('utf-8'))
+
+
+def sequential_keys(count: int, prefix: str = 'str') -> list:
+    """Return keys of the form prefix + i, the pattern used by the PDF examples."""
+    return [prefix + str(i) for i in range(count)]
+
+
+def random_keys(count: int, seed: int = 0) -> list:
+    """Return distinct random lowercase keys of 6 to 12 characters."""
+    rnd = random.Random(seed)
+    keys = set()
+    while len(keys) < count:
+        keys.add(''.join(rnd.choice(LETTERS) for _ in range(rnd.randint(6, 12))))
+    return list(keys)
+
+
+def anagram_keys(count: int, seed: int = 0, words: int = 50) -> list:
+    """
+    Return distinct keys that are permutations of a small set of base words, so most keys
+    have an anagram in the set and collide under hash_function_1.
+    """
+    rnd = random.Random(seed)
+    bases = [list(word) for word in random_keys(words, seed)]
+    keys = set()
+    while len(keys) < count:
+        letters = rnd.choice(bases)
+        rnd.shuffle(letters)
+        keys.add(''.join(letters))
+    return list(keys)
+
+
+def zipfian_keys(count: int, seed: int = 0, vocabulary: int = None, exponent: float = 1.1) -> list:
+    """
+    Return count keys drawn with replacement from a vocabulary with Zipfian weights, so a few
+    keys repeat very often and most appear once or not at all.
+    """
+    rnd = random.Random(seed)
+    words = random_keys(vocabulary or count, seed)
+    weights = [1 / rank ** exponent for rank in range(1, len(words) + 1)]
+    return rnd.choices(words, weights, k=count)
+
+
+def best_of(function, repeat: int = 5) -> float:
+    """Run a zero-argument callable repeat times and return the fastest wall time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_with_setup(setup, action, repeat: int) -> float:
+    """
+    Return the fastest of repeat runs of action(state), where state = setup() is rebuilt
+    before every run and not timed.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        action(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bytes_per_entry(cls, keys: list) -> float:
+    """Build a map of the given class from keys and return traced bytes per entry."""
+    tracemalloc.start()
+    try:
+        m = cls(11, hash)
+        m.put_many((key, None) for key in keys)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / m.get_size()
+
+
+def print_table(headers: list, rows: list) -> None:
+    """Print rows as a plain fixed-width table."""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    print('  '.join(str(cell).rjust(width) for cell, width in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(str(cell).rjust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,172 @@
+# Description: Benchmark suite covering both HashMap implementations and a
+#              built-in dict baseline. Every operation is timed for each hash
+#              function and key distribution, and the results are written as
+#              JSON so runs from different releases can be compared.
+#
+#              python -m benchmarks.suite --count 20000 --output results.json
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+import hash_map_oa
+import hash_map_sc
+from benchmarks.common import (anagram_keys, best_of, random_keys, sequential_keys, time_with_setup,
+                               zipfian_keys)
+
+MAPS = {'SC': hash_map_sc.HashMap, 'OA': hash_map_oa.HashMap}
+
+FUNCTIONS = {'hash_function_1': hash_function_1, 'hash_function_2': hash_function_2}
+
+DISTRIBUTIONS = {
+    'sequential': sequential_keys,
+    'anagram': anagram_keys,
+    'uniform': random_keys,
+    'zipfian': zipfian_keys,
+}
+
+
+def bench_map(cls, function, keys: list, misses: list, repeat: int) -> dict:
+    """Return {operation: seconds} for one HashMap class and hash function."""
+    def build():
+        m = cls(11, function)
+        for key in keys:
+            m.put(key, key)
+        return m
+
+    def put_all(m):
+        for key in keys:
+            m.put(key, key)
+
+    def get_all(m, lookup):
+        for key in lookup:
+            m.get(key)
+
+    def remove_all(m):
+        for key in keys:
+            m.remove(key)
+
+    filled = build()
+    return {
+        'put': time_with_setup(lambda: cls(11, function), put_all, repeat),
+        'get_hit': best_of(lambda: get_all(filled, keys), repeat),
+        'get_miss': best_of(lambda: get_all(filled, misses), repeat),
+        'remove': time_with_setup(build, remove_all, repeat),
+        'resize_table': time_with_setup(build, lambda m: m.resize_table(m.get_capacity() * 2), repeat),
+        'get_keys_and_values': best_of(filled.get_keys_and_values, repeat),
+    }
+
+
+def bench_dict(keys: list, misses: list, repeat: int) -> dict:
+    """Return {operation: seconds} for the same operations on a built-in dict."""
+    def build():
+        return {key: key for key in keys}
+
+    def put_all(d):
+        for key in keys:
+            d[key] = key
+
+    def get_all(d, lookup):
+        for key in lookup:
+            d.get(key)
+
+    def remove_all(d):
+        for key in keys:
+            d.pop(key, None)
+
+    def find_mode():
+        frequency = {}
+        for key in keys:
+            frequency[key] = frequency.get(key, 0) + 1
+        highest = max(frequency.values())
+        return [key for key, value in frequency.items() if value == highest], highest
+
+    filled = build()
+    return {
+        'put': time_with_setup(dict, put_all, repeat),
+        'get_hit': best_of(lambda: get_all(filled, keys), repeat),
+        'get_miss': best_of(lambda: get_all(filled, misses), repeat),
+        'remove': time_with_setup(build, remove_all, repeat),
+        'get_keys_and_values': best_of(lambda: list(filled.items()), repeat),
+        'find_mode': best_of(find_mode, repeat),
+    }
+
+
+def git_revision() -> str:
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(count: int, repeat: int, maps: list, functions: list, distributions: list) -> dict:
+    """Run the whole suite and return the JSON-ready report."""
+    results = []
+
+    def record(map_name, function_name, distribution, timings, keys):
+        for operation, seconds in timings.items():
+            results.append({
+                'map': map_name,
+                'function': function_name,
+                'distribution': distribution,
+                'operation': operation,
+                'n': len(keys),
+                'seconds': seconds,
+                'ns_per_op': seconds / len(keys) * 1e9,
+            })
+
+    for distribution in distributions:
+        keys = DISTRIBUTIONS[distribution](count)
+        misses = sequential_keys(len(keys), prefix='miss')
+        keys_array = DynamicArray(keys)
+
+        for function_name in functions:
+            for map_name in maps:
+                timings = bench_map(MAPS[map_name], FUNCTIONS[function_name], keys, misses, repeat)
+                record(map_name, function_name, distribution, timings, keys)
+
+        # find_mode always counts with a default (hash_function_1) SC map
+        timings = {'find_mode': best_of(lambda: hash_map_sc.find_mode(keys_array), repeat)}
+        record('SC', 'hash_function_1', distribution, timings, keys)
+
+        record('dict', 'builtin', distribution, bench_dict(keys, misses, repeat), keys)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': sys.version,
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'git_revision': git_revision(),
+            'count': count,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='HashMap benchmark suite with JSON output')
+    parser.add_argument('--count', type=int, default=20_000, help='keys per distribution')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, the best is kept')
+    parser.add_argument('--maps', nargs='+', choices=sorted(MAPS), default=sorted(MAPS))
+    parser.add_argument('--functions', nargs='+', choices=sorted(FUNCTIONS), default=sorted(FUNCTIONS))
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS),
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    report = run(args.count, args.repeat, args.maps, args.functions, args.distributions)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
@@ -0,0 +1,114 @@
+# Description: Capacity planning shared by both HashMaps. The odd primes below
+#              2 ** 16 are sieved once at import and looked up with a binary
+#              search, instead of trial dividing on every construction and
+#              resize. Larger capacities are found by testing the odd numbers
+#              from the requested capacity upwards with a deterministic
+#              Miller-Rabin test, so no table beyond 2 ** 16 is ever built and
+#              the cost stays in microseconds at any size.
+#              Power-of-two tables use next_power_of_two and mix_hash instead.
+
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from math import isqrt
+
+# primes up to this limit are sieved at import time and looked up directly
+_TABLE_LIMIT = 1 << 16
+
+# Miller-Rabin with these bases is exact for every n below 3.3 * 10 ** 24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Fibonacci hashing multiplier, 2 ** 64 divided by the golden ratio
+_MIX_MULTIPLIER = 0x9e3779b97f4a7c15
+_MASK_64 = (1 << 64) - 1
+
+
+def _sieve(limit: int) -> array:
+    """Return an array of the odd primes less than or equal to limit."""
+    is_prime = bytearray([1]) * (limit + 1)
+    is_prime[0:3] = b'\x00\x00\x00'
+
+    for factor in range(3, isqrt(limit) + 1, 2):
+        if is_prime[factor]:
+            is_prime[factor * factor::2 * factor] = bytes(len(range(factor * factor, limit + 1, 2 * factor)))
+
+    # even numbers are never used, only odd primes are candidate capacities
+    return array('q', compress(range(3, limit + 1, 2), is_prime[3::2]))
+
+
+_primes = _sieve(_TABLE_LIMIT)
+
+# candidates sharing a factor with these are ruled out before the Miller-Rabin rounds
+_SMALL_PRIMES = tuple(_primes[:53])
+
+
+def _is_large_prime(candidate: int) -> bool:
+    """
+    Return True if an odd candidate above the prime table is prime, by trial division with the
+    small primes and then Miller-Rabin rounds with the _WITNESSES bases.
+    """
+    for factor in _SMALL_PRIMES:
+        if candidate % factor == 0:
+            return False
+
+    # candidate - 1 = odd * 2 ** shift
+    odd, shift = candidate - 1, 0
+    while odd % 2 == 0:
+        odd //= 2
+        shift += 1
+
+    for witness in _WITNESSES:
+        x = pow(witness, odd, candidate)
+        if x == 1 or x == candidate - 1:
+            continue
+        for _ in range(shift - 1):
+            x = x * x % candidate
+            if x == candidate - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    Return the smallest odd prime greater than or equal to capacity, which is the value
+    HashMap._next_prime has always produced (so 2 maps to 3).
+    """
+    if capacity <= _primes[-1]:
+        return _primes[bisect_left(_primes, capacity)]
+
+    # prime gaps are a few dozen at most at these sizes, so only a handful of tests run
+    candidate = capacity | 1
+    while not _is_large_prime(candidate):
+        candidate += 2
+    return candidate
+
+
+def is_prime(capacity: int) -> bool:
+    """Return True if capacity is a prime number."""
+    if capacity == 2:
+        return True
+    if capacity < 3 or capacity % 2 == 0:
+        return False
+
+    if capacity <= _primes[-1]:
+        return _primes[bisect_left(_primes, capacity)] == capacity
+    return _is_large_prime(capacity)
+
+
+def next_power_of_two(capacity: int) -> int:
+    """Return the smallest power of two greater than or equal to capacity (1 for capacity <= 1)."""
+    return 1 << max(capacity - 1, 0).bit_length()
+
+
+def mix_hash(hash_value: int) -> int:
+    """
+    Spread a hash over 64 bits so that its low bits depend on all of its bits, as a power-of-two
+    table only looks at the low bits. Multiplies by the Fibonacci hashing constant and folds the
+    high half back onto the low half.
+    """
+    mixed = (hash_value * _MIX_MULTIPLIER) & _MASK_64
+    return mixed ^ (mixed >> 32)
+
@@ -0,0 +1,199 @@
+# Description: Well-mixing hash functions that either HashMap takes as
+#              function=, and an analyzer that measures how evenly a hash
+#              function spreads a sample of keys over a table. The sample
+#              hash functions in a6_include sum character codes, so anagrams
+#              collide and short keys land in a narrow range of hashes; the
+#              functions here hash the key's utf-8 bytes and mix every bit.
+#
+#              fnv1a_hash    64-bit FNV-1a, one multiply per byte
+#              mix64_hash    the key's bytes reduced modulo a 64-bit prime in C,
+#                            then a murmur3 finalizer, the fastest of the three
+#              seeded_hash   factory for keyed BLAKE2b hashes, whose random
+#                            key makes colliding inputs impossible to
+#                            precompute (hash flooding)
+
+import hashlib
+import os
+import time
+
+from a6_include import hash_function_1, hash_function_2
+
+_MASK_64 = (1 << 64) - 1
+
+_FNV_OFFSET_BASIS = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+
+# 2 ** 64 - 59
+_MIX_PRIME = 0xffffffffffffffc5
+
+
+def fnv1a_hash(key: str) -> int:
+    """Return the 64-bit FNV-1a hash of the key's utf-8 bytes."""
+    hash_value = _FNV_OFFSET_BASIS
+    for byte in key.encode('utf-8', 'surrogatepass'):
+        hash_value = ((hash_value ^ byte) * _FNV_PRIME) & _MASK_64
+    return hash_value
+
+
+def _fmix64(hash_value: int) -> int:
+    """murmur3's 64-bit finalizer, every input bit affects every output bit."""
+    hash_value ^= hash_value >> 33
+    hash_value = (hash_value * 0xff51afd7ed558ccd) & _MASK_64
+    hash_value ^= hash_value >> 33
+    hash_value = (hash_value * 0xc4ceb9fe1a85ec53) & _MASK_64
+    hash_value ^= hash_value >> 33
+    return hash_value
+
+
+def mix64_hash(key: str) -> int:
+    """
+    Return a 64-bit hash of the key's utf-8 bytes. The bytes are read as one integer (after a
+    marker byte, so keys that differ only in trailing NULs stay apart) and reduced modulo the
+    largest 64-bit prime, both in C, then every bit is mixed by the murmur3 finalizer.
+    """
+    value = int.from_bytes(b'\x01' + key.encode('utf-8', 'surrogatepass'), 'big')
+    return _fmix64(value % _MIX_PRIME)
+
+
+def seeded_hash(seed: bytes = None):
+    """
+    Return a hash function computing keyed 64-bit BLAKE2b of the key's utf-8 bytes. Without a
+    seed a random 16-byte one is drawn, so hashes differ between processes: pass the seed (up
+    to 64 bytes) to get the same hashes again, and pass the returned function explicitly to
+    HashMap.load, which cannot import it by name.
+    """
+    if seed is None:
+        seed = os.urandom(16)
+
+    blake2b = hashlib.blake2b
+
+    def keyed_hash(key: str) -> int:
+        """Keyed 64-bit BLAKE2b of the key's utf-8 bytes."""
+        digest = blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8, key=seed).digest()
+        return int.from_bytes(digest, 'little')
+
+    return keyed_hash
+
+
+# ------------------------------------------------------------------ #
+
+def analyze(keys: list, capacity: int, function) -> dict:
+    """
+    Measure how a hash function spreads distinct keys over a table of the given capacity.
+    Returns a dictionary of:
+
+    ns_per_key          time to hash one key
+    distinct_hashes     fraction of keys whose full hash no other key shares
+    occupancy           fraction of buckets holding at least one key, and the
+    expected_occupancy  same fraction for a perfectly random hash
+    chi_square          chi-square statistic of the bucket counts against a uniform spread,
+    chi_square_ratio    divided by its degrees of freedom, so about 1.0 for a random hash
+    max_chain_length    largest number of keys in one bucket
+    sc_probe_length     average nodes compared by a successful separate chaining lookup
+    oa_probe_length     average slots probed by a successful quadratic probing lookup with the
+                        keys inserted in order, None when there are more keys than slots
+    """
+    keys = list(keys)
+    count = len(keys)
+
+    start = time.perf_counter()
+    hashes = [function(key) for key in keys]
+    seconds = time.perf_counter() - start
+
+    chains = [0] * capacity
+    for hash_value in hashes:
+        chains[hash_value % capacity] += 1
+
+    expected = count / capacity
+    chi_square = sum((chain - expected) ** 2 for chain in chains) / expected if count else 0.0
+    degrees = max(capacity - 1, 1)
+
+    hash_counts = {}
+    for hash_value in hashes:
+        hash_counts[hash_value] = hash_counts.get(hash_value, 0) + 1
+    unique = sum(1 for hash_count in hash_counts.values() if hash_count == 1)
+
+    return {
+        'ns_per_key': seconds / count * 1e9 if count else 0.0,
+        'distinct_hashes': unique / count if count else 1.0,
+        'occupancy': sum(1 for chain in chains if chain) / capacity,
+        'expected_occupancy': 1 - (1 - 1 / capacity) ** count,
+        'chi_square': chi_square,
+        'chi_square_ratio': chi_square / degrees,
+        'max_chain_length': max(chains),
+        'sc_probe_length': sum(chain * (chain + 1) / 2 for chain in chains) / count if count else 0.0,
+        'oa_probe_length': _quadratic_probe_length(hashes, capacity),
+    }
+
+
+def _quadratic_probe_length(hashes: list, capacity: int) -> float:
+    """
+    Insert the hashes into a quadratic probing table of the given capacity and return the
+    average number of slots a later lookup of each probes, or None if they cannot all fit.
+    """
+    if not hashes or len(hashes) > capacity:
+        return None
+
+    taken = bytearray(capacity)
+    total = 0
+
+    for hash_value in hashes:
+        initial_index = hash_value % capacity
+        index = initial_index
+        j = 0
+
+        # quadratic probing may miss free slots of a full-ish table, give up like the map would
+        while taken[index]:
+            j += 1
+            if j >= capacity:
+                return None
+            index = (initial_index + j ** 2) % capacity
+
+        taken[index] = 1
+        total += j + 1
+
+    return total / len(hashes)
+
+
+def compare(keys: list, capacity: int, functions: dict) -> dict:
+    """
+    Run analyze for every {name: function} on the same key sample and return {name: report}.
+    """
+    keys = list(keys)
+    return {name: analyze(keys, capacity, function) for name, function in functions.items()}
+
+
+FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a_hash': fnv1a_hash,
+    'mix64_hash': mix64_hash,
+    'seeded_hash': seeded_hash(b'analyzer'),
+}
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    from hash_map_oa import HashMap as OpenAddressingMap
+    from hash_map_sc import HashMap as SeparateChainingMap
+
+    print("\nHash functions - both maps")
+    print("--------------------------")
+    for function in (fnv1a_hash, mix64_hash, seeded_hash(b'seed')):
+        for cls in (SeparateChainingMap, OpenAddressingMap):
+            m = cls(11, function)
+            for i in range(300):
+                m.put('str' + str(i), i)
+            m.remove('str0')
+            print(cls.__module__, function.__name__, m.get_size(), m.get('str299'), m.contains_key('str0'))
+
+    print("\nHash functions - anagrams")
+    print("-------------------------")
+    anagrams = ['listen', 'silent', 'enlist', 'tinsel', 'inlets']
+    for name, function in FUNCTIONS.items():
+        print(name, len({function(key) for key in anagrams}))
+
+    print("\nHash functions - seeds")
+    print("----------------------")
+    print(seeded_hash(b'a')('key') == seeded_hash(b'a')('key'), seeded_hash(b'a')('key') == seeded_hash(b'b')('key'))
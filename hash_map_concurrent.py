@@ -0,0 +1,409 @@
+# Description: Thread-safe separate chaining HashMap using lock striping.
+#              Buckets are split into stripes that each have their own lock,
+#              so put / get / remove on buckets in different stripes run
+#              without waiting on each other. Resizing and whole-table
+#              operations take every stripe lock. No operation relies on the
+#              GIL, so the map stays correct on free-threaded CPython builds.
+
+import threading
+from contextlib import contextmanager
+
+from a6_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_sc import HashMap
+
+
+class ConcurrentHashMap(HashMap):
+    """
+    Separate chaining HashMap that can be shared between threads. The public API matches
+    hash_map_sc.HashMap. Incremental resizing and self-organizing chains are not available in
+    this variant.
+
+    keys(), values() and items() do not lock: they raise RuntimeError if another thread adds or
+    removes a key while they run. get_keys_and_values() returns a consistent snapshot instead.
+    """
+
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 stripes: int = 16,
+                 shrink_threshold: float = 0.25) -> None:
+        """
+        Initialize new HashMap whose buckets are guarded by the given number of stripe locks.
+        shrink_threshold works as in hash_map_sc.HashMap, 0.0 turns shrinking off.
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+
+        super().__init__(capacity, function, shrink_threshold=shrink_threshold)
+
+        # stripe locks are reentrant so whole-table operations can call resize_table
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+        # guards _size, always taken after a stripe lock and never before one
+        self._size_lock = threading.Lock()
+
+    def _lock_bucket(self, hash_value: int) -> threading.RLock:
+        """
+        Acquire and return the stripe lock of the bucket a hash maps to. The capacity is checked
+        again once the lock is held, because a resize may have replaced the table in between.
+        """
+        locks = self._locks
+        while True:
+            capacity = self._capacity
+            lock = locks[hash_value % capacity % len(locks)]
+            lock.acquire()
+
+            if self._capacity == capacity:
+                return lock
+            lock.release()
+
+    @contextmanager
+    def _all_locks(self):
+        """
+        Hold every stripe lock, always acquired in the same order, for whole-table operations.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def _add_size(self, delta: int) -> int:
+        """
+        Change the size under its lock and return the new size.
+        """
+        with self._size_lock:
+            self._size += delta
+            self._modcount += 1
+            return self._size
+
+    # ------------------------------------------------------------------ #
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        with self._size_lock:
+            return self._size
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Method that updates the key-value pair in a hash map and any existing keys given will have their
+        value replaced with the new one. Otherwise, the key-value pair is added into the hash map.
+
+        The table is doubled once the load factor reaches 1.0.
+        """
+        hash_value = self._hash_function(key)
+        lock = self._lock_bucket(hash_value)
+
+        try:
+            bucket = self._buckets[hash_value % self._capacity]
+
+            # existing key -- replace value with new value
+            for item in bucket:
+                if item.hash == hash_value and item.key == key:
+                    item.value = value
+                    return
+
+            # key does not exist, add key-value pair into hash map
+            bucket.insert(key, value, hash_value)
+            size = self._add_size(1)
+        finally:
+            lock.release()
+
+        if size >= self._capacity:
+            self._grow()
+
+    def _grow(self) -> None:
+        """
+        Double the table if the load factor is still at or above 1.0 once every stripe is held,
+        so threads that cross the threshold together only resize once.
+        """
+        with self._all_locks():
+            if self._size >= self._capacity:
+                self._auto_resize(self._capacity * 2)
+
+    @staticmethod
+    def _capacity_for(count: int) -> int:
+        """
+        Return the smallest capacity that takes count entries without put resizing. put grows
+        right after the insert that brings the load factor to 1.0, so count entries need one more
+        bucket than in hash_map_sc.HashMap.
+        """
+        return count + 1
+
+    def _release_room(self) -> bool:
+        """
+        Shrink the table if the shrink policy still calls for it once every stripe is held.
+        """
+        # a shrink needs a sparse table with room above the floor, checked without locks (and
+        # without changing anything) so most removes never wait on the other stripes
+        if (not self._shrink_threshold or self._size > self._shrink_threshold * self._capacity
+                or self._capacity // 2 < self._min_capacity):
+            return False
+
+        with self._all_locks():
+            return super()._release_room()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that changes the capacity of the hash table while holding every stripe lock.
+        """
+        with self._all_locks():
+            super().resize_table(new_capacity)
+
+    def _upsert(self, key: str, function, default: object) -> object:
+        """
+        Shared body of update_with, increment and setdefault, run under the bucket's stripe lock.
+        function=None keeps the value of an existing key.
+        """
+        hash_value = self._hash_function(key)
+        lock = self._lock_bucket(hash_value)
+
+        try:
+            bucket = self._buckets[hash_value % self._capacity]
+
+            for item in bucket:
+                if item.hash == hash_value and item.key == key:
+                    if function is not None:
+                        item.value = function(item.value)
+                    return item.value
+
+            value = default if function is None else function(default)
+            bucket.insert(key, value, hash_value)
+            size = self._add_size(1)
+        finally:
+            lock.release()
+
+        if size >= self._capacity:
+            self._grow()
+        return value
+
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        Method that atomically replaces the value of a key with function(value) and returns the new
+        value. A key that does not exist is added with the value function(default).
+        """
+        return self._upsert(key, function, default)
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Method that atomically adds delta to the value of a key and returns the new value. A key
+        that does not exist is added with the value delta.
+        """
+        return self._upsert(key, lambda value: value + delta, 0)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Method that returns the value of a key, atomically adding the key with the value default
+        if it does not exist.
+        """
+        return self._upsert(key, None, default)
+
+    def get(self, key: str):
+        """
+        Method that returns the value using the key and returns None if the key does not exist within
+        the hash map.
+        """
+        hash_value = self._hash_function(key)
+        lock = self._lock_bucket(hash_value)
+
+        try:
+            for item in self._buckets[hash_value % self._capacity]:
+                if item.hash == hash_value and item.key == key:
+                    return item.value
+            return None
+        finally:
+            lock.release()
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Method that returns True if there exists the key in the hash map and returns False if it does not.
+        """
+        hash_value = self._hash_function(key)
+        lock = self._lock_bucket(hash_value)
+
+        try:
+            for item in self._buckets[hash_value % self._capacity]:
+                if item.hash == hash_value and item.key == key:
+                    return True
+            return False
+        finally:
+            lock.release()
+
+    def remove(self, key: str) -> None:
+        """
+        Method that simply removes the given key-value pair from the hash map.
+        """
+        hash_value = self._hash_function(key)
+        lock = self._lock_bucket(hash_value)
+
+        try:
+            removed = self._buckets[hash_value % self._capacity].remove(key)
+            if removed:
+                self._add_size(-1)
+        finally:
+            lock.release()
+
+        if removed:
+            self._release_room()
+
+    # whole-table operations run with every stripe held
+
+    def table_load(self) -> float:
+        """
+        Method that returns the load factor of the hash table.
+        """
+        with self._all_locks():
+            return super().table_load()
+
+    def empty_buckets(self) -> int:
+        """
+        Method that returns how many empty buckets exist within the hash table.
+        """
+        with self._all_locks():
+            return super().empty_buckets()
+
+    def clear(self) -> None:
+        """
+        Method that wipes out the contents in the hash map without changing the capacity.
+        """
+        with self._all_locks():
+            super().clear()
+
+    def put_many(self, pairs) -> None:
+        """
+        Method that puts every (key, value) pair from an iterable into the hash map as one
+        operation, holding every stripe lock.
+        """
+        pairs = list(pairs)
+        with self._all_locks():
+            super().put_many(pairs)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Method that returns a dynamic array with the value of each key from an iterable, holding
+        every stripe lock so the values come from one consistent state of the map.
+        """
+        keys = list(keys)
+        with self._all_locks():
+            return super().get_many(keys)
+
+    def remove_many(self, keys) -> None:
+        """
+        Method that removes every key from an iterable out of the hash map as one operation.
+        """
+        keys = list(keys)
+        with self._all_locks():
+            super().remove_many(keys)
+
+    def get_stats(self) -> dict:
+        """
+        Method that returns the statistics dictionary of hash_map_sc.HashMap.get_stats.
+        """
+        with self._all_locks():
+            return super().get_stats()
+
+    def save(self, path) -> None:
+        """
+        Method that writes a snapshot of one consistent state of the map, see hash_map_sc.HashMap.save.
+        """
+        with self._all_locks():
+            super().save(path)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Method that returns a dynamic array of tuple key-value pairs from one consistent state of the map.
+        """
+        with self._all_locks():
+            return super().get_keys_and_values()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        with self._all_locks():
+            return super().__str__()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nStress - disjoint writers, shared readers")
+    print("-----------------------------------------")
+    m = ConcurrentHashMap(11, hash_function_2, stripes=8)
+    threads_count, per_thread = 8, 5000
+    errors = []
+
+    def writer(thread_id: int) -> None:
+        """Insert, overwrite and remove a private range of keys, checking reads as we go."""
+        prefix = 't' + str(thread_id) + '-'
+        for i in range(per_thread):
+            m.put(prefix + str(i), i)
+        for i in range(0, per_thread, 2):
+            m.put(prefix + str(i), -i)
+        for i in range(0, per_thread, 4):
+            m.remove(prefix + str(i))
+        for i in range(per_thread):
+            expected = None if i % 4 == 0 else (-i if i % 2 == 0 else i)
+            if m.get(prefix + str(i)) != expected:
+                errors.append((prefix + str(i), m.get(prefix + str(i)), expected))
+
+    def reader() -> None:
+        """Hammer shared lookups and whole-table reads while the writers run."""
+        for _ in range(200):
+            m.contains_key('t0-1')
+            m.get_size()
+        m.get_keys_and_values()
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads_count)]
+    workers += [threading.Thread(target=reader) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    expected_size = threads_count * (per_thread - len(range(0, per_thread, 4)))
+    print(m.get_size() == expected_size, m.get_keys_and_values().length() == expected_size, errors == [])
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nStress - shared keys")
+    print("--------------------")
+    m = ConcurrentHashMap(11, hash_function_1, stripes=4)
+
+    def shared(thread_id: int) -> None:
+        """Every thread puts and removes the same small key set."""
+        for i in range(3000):
+            key = 'k' + str(i % 50)
+            if (i + thread_id) % 3:
+                m.put(key, thread_id)
+            else:
+                m.remove(key)
+
+    workers = [threading.Thread(target=shared, args=(n,)) for n in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    print(m.get_size() == m.get_keys_and_values().length(), m.get_size() <= 50)
+
+    print("\nStress - shared counters")
+    print("------------------------")
+    m = ConcurrentHashMap(11, hash_function_2, stripes=4)
+
+    def count(thread_id: int) -> None:
+        """Every thread increments the same counters, so no increment may be lost."""
+        for i in range(4000):
+            m.increment('c' + str(i % 40))
+
+    workers = [threading.Thread(target=count, args=(n,)) for n in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    print(m.get_size() == 40, all(m.get('c' + str(i)) == 800 for i in range(40)))
@@ -7,25 +7,64 @@
 #               proper open addressing techniques with quadratic probing.
 
 from a6_include import (DynamicArray, DynamicArrayException, HashEntry,
-                        hash_function_1, hash_function_2)
+                        batch_hash_function, hash_function_1, hash_function_2)
+from capacity import is_prime, mix_hash, next_power_of_two, next_prime
+from resize_policy import ResizePolicy
+from snapshot import paused_gc, read_snapshot, write_snapshot
+from stats import HashMapStats, records_resizes, report
 
 
-class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+class HashMap(ResizePolicy):
+
+    # put grows the table once the load factor reaches 0.5
+    _GROW_LOAD = 0.5
+
+    def __init__(self, capacity: int, function, tombstone_threshold: float = 0.75,
+                 shrink_threshold: float = 0.125) -> None:
         """
         Initialize new HashMap that uses
         quadratic probing for collision resolution
         DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        tombstone_threshold is the fraction of slots held by live entries plus tombstones at
+        which put rehashes the table in place to clear the tombstones out.
+
+        shrink_threshold is the load factor at or below which remove halves the table, never
+        going under the floor described in resize_policy. It must stay under half the 0.5
+        growth point so a halved table is not grown straight back, and 0.0 turns shrinking off.
         """
+        self._init_bookkeeping(function, tombstone_threshold, shrink_threshold)
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, at least 3 as the assignment's next prime never gives 2
+        self._capacity = self._round_capacity(max(capacity, 3))
         for _ in range(self._capacity):
             self._buckets.append(None)
 
-        self._hash_function = function
         self._size = 0
+        self._tombstones = 0
+
+    def _init_bookkeeping(self, function, tombstone_threshold: float,
+                          shrink_threshold: float) -> None:
+        """
+        Check the thresholds and set up the fields every open addressing map keeps besides its
+        table, size and tombstone count. Shared by the constructors of the subclasses.
+        """
+        if not 0.5 < tombstone_threshold <= 1.0:
+            raise ValueError("tombstone_threshold must be in (0.5, 1.0]")
+
+        self._hash_function = function
+        self._tombstone_threshold = tombstone_threshold
+
+        # remove shrinks the table back towards the capacity it was created with
+        self._init_resize_policy(shrink_threshold)
+
+        # bumped by every insert, removal, resize and clear so iterators can detect them
+        self._modcount = 0
+
+        # resize telemetry, None unless enable_stats() was called
+        self._stats = None
 
     def __str__(self) -> str:
         """
@@ -41,34 +80,29 @@ class HashMap:
         """
         Increment from given number to find the closest prime number
         DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
 
-        return capacity
+        Delegates to capacity.next_prime.
+        """
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
         DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+        Delegates to capacity.is_prime.
+        """
+        return is_prime(capacity)
 
-        return True
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Round a requested capacity up to one the table can use, here a prime. Every capacity the
+        map picks goes through this method, so a subclass with another capacity rule overrides it.
+        """
+        if self._is_prime(capacity):
+            return capacity
+        return self._next_prime(capacity)
 
     def get_size(self) -> int:
         """
@@ -84,8 +118,21 @@ class HashMap:
         """
         return self._capacity
 
+    def get_tombstone_count(self) -> int:
+        """
+        Return the number of slots holding tombstones left behind by remove
+        """
+        return self._tombstones
+
     # ------------------------------------------------------------------ #
 
+    def _hash_many(self, keys: list) -> list:
+        """
+        Hash a list of keys with the map's hash function in one pass, using the vectorized
+        batch version of hash_function_1 / hash_function_2 when available. Used for bulk loads.
+        """
+        return batch_hash_function(self._hash_function)(keys)
+
     def put(self, key: str, value: object) -> None:
         """
         Method that updates the key-value pair in a hash map and any existing keys given will have their
@@ -93,37 +140,166 @@ class HashMap:
 
         Table resizes are doubled from its capacity and the load factor is greater than or equal to 0.5.
         """
-        new_entry = HashEntry(key, value)
+        self._make_room()
+        self._insert(key, value, self._hash_function(key))
 
+    def _make_room(self) -> bool:
+        """
+        Resize ahead of one more insert if the load factor rules call for it. Returns True if
+        the table was rebuilt, which moves every entry to a new index.
+        """
         # resize if load factor greater than or equal to 0.5
         load_factor = self.table_load()
 
         if load_factor >= 0.5:
             double_capacity = self._capacity * 2
-            self.resize_table(double_capacity)
+            self._auto_resize(double_capacity)
+            return True
+
+        # rehash in place if tombstones have filled up the probe sequences
+        if self._tombstones and self._occupied_load(1) >= self._tombstone_threshold:
+            self.resize_table(self._capacity)
+            return True
+
+        return False
+
+    def _insert(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Insert or update a key whose hash is already known, without any load factor check.
+        """
+        index, found = self._probe(key, hash_value)
+
+        # replace existing value with new value
+        if found:
+            self._set_value(index, value)
+            return
+
+        self._store(index, key, value, hash_value)
+
+    def _store(self, index: int, key: str, value: object, hash_value: int) -> None:
+        """
+        Add a key that _probe reported absent at the index it returned.
+        """
+        # insert key-value pair at the first reusable slot (tombstone or empty)
+        if self._buckets[index] is not None:
+            self._tombstones -= 1
+        self._buckets[index] = HashEntry(key, value, hash_value)
+        self._size += 1
+        self._modcount += 1
+
+    def _value(self, index: int) -> object:
+        """
+        Return the value of the live entry at index.
+        """
+        return self._buckets[index].value
+
+    def _set_value(self, index: int, value: object) -> None:
+        """
+        Replace the value of the live entry at index.
+        """
+        self._buckets[index].value = value
 
-        # get the hash value and its index
+    def _locate(self, key: str) -> tuple[int, bool, int]:
+        """
+        Hash and probe a key once for the upsert methods. Returns (index, found, hash). When the
+        key is absent the table is first made room for, and index is where the key belongs.
+        """
         hash_value = self._hash_function(key)
-        initial_index = hash_value % self.get_capacity()
+        index, found = self._probe(key, hash_value)
+
+        # only a rebuild moves the slot the key belongs in, so probe again only then
+        if not found and self._make_room():
+            index, found = self._probe(key, hash_value)
+
+        return index, found, hash_value
+
+    def _delete(self, index: int) -> None:
+        """
+        Remove the live entry at the given index by turning it into a tombstone.
+        """
+        self._buckets[index].is_tombstone = True
+        self._size -= 1
+        self._modcount += 1
+        self._tombstones += 1
+
+    def _occupied_load(self, incoming: int = 0) -> float:
+        """
+        Return the fraction of slots that would be taken by live entries and tombstones
+        after incoming more inserts.
+        """
+        return (self._size + self._tombstones + incoming) / self._capacity
+
+    def _probe(self, key: str, hash_value: int) -> tuple[int, bool]:
+        """
+        Shared quadratic probing engine used by put, get, contains_key and remove.
+
+        Returns (index, True) when a live entry with the key is found. Otherwise returns
+        (index, False) where index is the first tombstone passed on the way, or the empty
+        slot that ended the search if no tombstone was seen. A never-used (None) slot ends
+        the search, so a miss costs the probe length rather than the whole capacity.
+        Keys are only compared when the cached hashes match.
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        initial_index = hash_value % capacity
         index = initial_index
+        first_tombstone = -1
 
         j = 0
-        while j < self._capacity:
+        while j < capacity:
+            entry = buckets[index]
 
-            # insert key-value pairs at this index
-            if self._buckets[index] is None or self._buckets[index].is_tombstone:
-                self._buckets[index] = new_entry
-                self._size += 1
-                return
+            # never-used slot, the key cannot be further along the sequence
+            if entry is None:
+                if first_tombstone < 0:
+                    return index, False
+                return first_tombstone, False
 
-            # replace existing value with new value
-            elif self._buckets[index].key == key:
-                self._buckets[index].value = value
-                return
+            # remember the first tombstone so an insert can reuse it
+            if entry.is_tombstone:
+                if first_tombstone < 0:
+                    first_tombstone = index
+
+            elif entry.hash == hash_value and entry.key == key:
+                return index, True
 
             # traverse to the next index using quadratic probing
             j += 1
-            index = (initial_index + j ** 2) % self._capacity
+            index = (initial_index + j ** 2) % capacity
+
+        return first_tombstone, False
+
+    def _place(self, entry: HashEntry) -> None:
+        """
+        Place a live entry whose key is known to be absent into the first empty slot of its
+        probe sequence, using the entry's cached hash. Used when rehashing.
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        initial_index = entry.hash % capacity
+        index = initial_index
+
+        j = 0
+        while buckets[index] is not None:
+            j += 1
+            index = (initial_index + j ** 2) % capacity
+
+        buckets[index] = entry
+        self._size += 1
+        self._modcount += 1
+
+    def _probe_length(self, index: int) -> int:
+        """
+        Return how many slots a lookup probes to reach the live entry at index (1 = home slot).
+        """
+        capacity = self._capacity
+        initial_index = self._buckets[index].hash % capacity
+
+        j = 0
+        while (initial_index + j ** 2) % capacity != index:
+            j += 1
+
+        return j + 1
 
     def table_load(self) -> float:
         """
@@ -138,6 +314,7 @@ class HashMap:
         # m total slots (m) and size filled slots (n), so m − n open spots.
         return self._capacity - self._size
 
+    @records_resizes
     def resize_table(self, new_capacity: int) -> None:
         """
         Method that changes the capacity of the hash table and rehashes existing key-value pairs into
@@ -146,46 +323,47 @@ class HashMap:
         if new_capacity < self._size:
             return
 
-        # check prime and get the next prime if not
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        new_capacity = self._fit_capacity(new_capacity)
 
-        # create new hash map to rehash innards
-        new_hash_map = HashMap(new_capacity, self._hash_function)
+        # create new hash map of the same kind to rehash innards
+        new_hash_map = type(self)(new_capacity, self._hash_function)
 
-        # rehash key-value pairs
+        # move live entries across using their cached hashes
         for num in range(self._capacity):
             item = self._buckets[num]
 
             if item and not item.is_tombstone:
-                new_hash_map.put(item.key, item.value)
+                new_hash_map._place(item)
 
-        # update new values of new hash map
+        # update new values of new hash map, tombstones are not carried across
         self._buckets, self._capacity = new_hash_map._buckets, new_hash_map._capacity
         self._size = new_hash_map._size
+        self._modcount += 1
+        self._tombstones = 0
 
-    def get(self, key: str) -> object:
+    def _fit_capacity(self, new_capacity: int) -> int:
         """
-        Method that returns the value using the key and returns None if the key does not exist within
-        the hash map.
+        Return the capacity resize_table uses for a requested capacity: rounded by
+        _round_capacity, then doubled until the live entries fit under the 0.5 load factor as put
+        would have done.
         """
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self.get_capacity()
-        index = initial_index
+        new_capacity = self._round_capacity(new_capacity)
 
-        # quadratic probing loop
-        j = 0
-        while j < self._capacity:
+        # keep doubling until the live entries fit under the 0.5 load factor, as put would
+        while self._size > 0 and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._round_capacity(new_capacity * 2)
 
-            if self._buckets[index]:
+        return new_capacity
 
-                # check if the key was found
-                if self._buckets[index].key == key and not self._buckets[index].is_tombstone:
-                    return self._buckets[index].value
+    def get(self, key: str) -> object:
+        """
+        Method that returns the value using the key and returns None if the key does not exist within
+        the hash map.
+        """
+        index, found = self._probe(key, self._hash_function(key))
 
-            # compute the next index in the probing sequence and repeat
-            j += 1
-            index = (initial_index + j ** 2) % self._capacity
+        if found:
+            return self._buckets[index].value
 
         return None
 
@@ -198,47 +376,120 @@ class HashMap:
         if self._size == 0:
             return False
 
-        # get value at this index using the key
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self.get_capacity()
-        index = initial_index
+        return self._probe(key, self._hash_function(key))[1]
 
-        j = 0
-        while j < self._capacity:
+    def remove(self, key: str) -> None:
+        """
+        Method that simply removes the given key-value pair from the hash map.
 
-            # key is present
-            if self._buckets[index] and self._buckets[index].key == key:
-                return True
+        The table is halved once the load factor drops to the shrink threshold.
+        """
+        index, found = self._probe(key, self._hash_function(key))
 
-            # compute the next index in the quadratic probing sequence
-            j += 1
-            index = (initial_index + j ** 2) % self._capacity
+        if found:
+            self._delete(index)
+            self._release_room()
 
-        return False
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        Method that replaces the value of a key with function(value) and returns the new value. A key
+        that does not exist is added with the value function(default). The key is hashed and probed once.
+        """
+        index, found, hash_value = self._locate(key)
 
-    def remove(self, key: str) -> None:
+        if found:
+            value = function(self._value(index))
+            self._set_value(index, value)
+        else:
+            value = function(default)
+            self._store(index, key, value, hash_value)
+
+        return value
+
+    def increment(self, key: str, delta: int = 1) -> int:
         """
-        Method that simply removes the given key-value pair from the hash map.
+        Method that adds delta to the value of a key and returns the new value. A key that does not
+        exist is added with the value delta. The key is hashed and probed once.
         """
-        hash_value = self._hash_function(key)
-        initial_index = hash_value % self.get_capacity()
-        index = initial_index
+        index, found, hash_value = self._locate(key)
 
-        # quadratic probing loop
-        j = 0
-        while j < self._capacity:
+        if found:
+            value = self._value(index) + delta
+            self._set_value(index, value)
+        else:
+            value = delta
+            self._store(index, key, value, hash_value)
 
-            if self._buckets[index]:
+        return value
 
-                # key found, replace with tombstone and decrement size
-                if self._buckets[index].key == key and not self._buckets[index].is_tombstone:
-                    self._buckets[index].is_tombstone = True
-                    self._size -= 1
-                    return
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Method that returns the value of a key, first adding the key with the value default if it
+        does not exist. The key is hashed and probed once.
+        """
+        index, found, hash_value = self._locate(key)
 
-            # compute the next index in the probing sequence and repeat
-            j += 1
-            index = (initial_index + j ** 2) % self._capacity
+        if found:
+            return self._value(index)
+
+        self._store(index, key, default, hash_value)
+        return default
+
+    def put_many(self, pairs) -> None:
+        """
+        Method that puts every (key, value) pair from an iterable into the hash map. The whole batch
+        is hashed in one pass and the table is resized at most once, up front, so that no insert in
+        the batch crosses the 0.5 load factor. Later pairs win over earlier pairs with the same key.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return
+
+        # size the table for the largest possible final size
+        needed = self._size + len(pairs)
+        if (needed - 1) / self._capacity >= 0.5:
+            self._auto_resize(2 * needed - 1)
+
+        # otherwise rehash in place if the batch would push tombstones past the threshold
+        elif self._tombstones and self._occupied_load(len(pairs)) >= self._tombstone_threshold:
+            self.resize_table(self._capacity)
+
+        hashes = self._hash_many([pair[0] for pair in pairs])
+        insert = self._insert
+
+        for (key, value), hash_value in zip(pairs, hashes):
+            insert(key, value, hash_value)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Method that returns a dynamic array with the value of each key from an iterable, in order,
+        and None for keys that do not exist within the hash map. The keys are hashed in one pass.
+        """
+        keys = list(keys)
+        values = DynamicArray()
+        buckets = self._buckets
+
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            index, found = self._probe(key, hash_value)
+            values.append(buckets[index].value if found else None)
+
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        Method that removes every key from an iterable out of the hash map. Keys that do not exist are
+        ignored. The keys are hashed in one pass.
+        """
+        keys = list(keys)
+
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            index, found = self._probe(key, hash_value)
+
+            if found:
+                self._delete(index)
+
+        # shrink once for the whole batch
+        self._release_room()
 
     def clear(self) -> None:
         """
@@ -252,6 +503,104 @@ class HashMap:
             self._buckets.append(None)
 
         self._size = 0
+        self._modcount += 1
+        self._tombstones = 0
+
+    def enable_stats(self) -> None:
+        """
+        Method that starts recording resize count and time for get_stats. In-place rehashes that
+        clear tombstones count as resizes.
+        """
+        if self._stats is None:
+            self._stats = HashMapStats()
+
+    def disable_stats(self) -> None:
+        """
+        Method that stops recording resize telemetry and discards what was recorded.
+        """
+        self._stats = None
+
+    def get_stats(self) -> dict:
+        """
+        Method that returns a dictionary of statistics: a histogram of probe lengths over the live
+        entries (1 = found in its home slot), the longest probe, resize count and cumulative seconds
+        (None unless stats are enabled), the tombstone count and the collision rate, the fraction of
+        live entries that are not in their home slot.
+        """
+        lengths = [self._probe_length(index) for index in self._live_indices()]
+        colliding = sum(1 for length in lengths if length > 1)
+        return report('probe', lengths, self._size, self._capacity, self._tombstones, colliding,
+                      self._stats)
+
+    def save(self, path) -> None:
+        """
+        Method that writes the hash map to a binary snapshot file. Every occupied slot is stored at
+        its index, tombstones included, so load restores the same layout without hashing any key.
+        """
+        write_snapshot(path, type(self), self._hash_function, self._capacity, self._size,
+                       self._tombstones, self._slot_columns())
+
+    @classmethod
+    def load(cls, path, function=None, **options) -> "HashMap":
+        """
+        Method that returns a hash map restored from a snapshot written by save, with no hashing
+        and no resizing. The hash function is imported by the name recorded in the file unless
+        one is given. Other keyword arguments are passed to the constructor.
+        """
+        with paused_gc():
+            function, capacity, size, tombstones, columns = read_snapshot(path, cls, function)
+
+            hash_map = cls(1, function, **options)
+            hash_map._restore_slots(capacity, columns)
+            hash_map._size = size
+            hash_map._tombstones = tombstones
+
+        return hash_map
+
+    def _slot_columns(self) -> tuple:
+        """
+        Return the occupied slots as snapshot columns: indices, hashes, tombstone flags, keys
+        and values.
+        """
+        indices, hashes, tombstones, keys, values = [], [], bytearray(), [], []
+        buckets = self._buckets
+
+        for index in range(self._capacity):
+            entry = buckets[index]
+            if entry is not None:
+                indices.append(index)
+                hashes.append(entry.hash)
+                tombstones.append(entry.is_tombstone)
+                keys.append(entry.key)
+                values.append(entry.value)
+
+        return indices, hashes, bytes(tombstones), keys, values
+
+    def _restore_slots(self, capacity: int, columns: tuple) -> None:
+        """
+        Replace the table with one of the given capacity holding the snapshot columns.
+        """
+        indices, hashes, tombstones, keys, values = columns
+        entries = list(map(HashEntry, keys, values, hashes))
+        slots = [None] * capacity
+
+        for index, entry in zip(indices, entries):
+            slots[index] = entry
+
+        # tombstones are rare, so only look for them when there are any
+        if tombstones.count(1):
+            for entry, is_tombstone in zip(entries, tombstones):
+                entry.is_tombstone = bool(is_tombstone)
+
+        self._buckets = DynamicArray(slots)
+        self._capacity = capacity
+
+    def _live_indices(self) -> list:
+        """
+        Return the indices of the slots holding live entries.
+        """
+        return [index for index in range(self._capacity)
+                if self._buckets[index] is not None and not self._buckets[index].is_tombstone]
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -270,37 +619,248 @@ class HashMap:
 
         return keys_and_values
 
+    def _iter_live(self):
+        """
+        Generate the indices of the slots holding live entries. Raises RuntimeError if the map has
+        an entry inserted or removed, is resized or is cleared while the generator is running.
+        """
+        modcount = self._modcount
+        buckets = self._buckets
+
+        for index in range(self._capacity):
+            entry = buckets[index]
+
+            # skip empty buckets and tombstones
+            if entry is None or entry.is_tombstone:
+                continue
+
+            yield index
+            if self._modcount != modcount:
+                raise RuntimeError("HashMap changed during iteration")
+
+    def _key(self, index: int) -> str:
+        """
+        Return the key of the live entry at index.
+        """
+        return self._buckets[index].key
+
+    def _entry(self, index: int) -> HashEntry:
+        """
+        Return the live entry at index.
+        """
+        return self._buckets[index]
+
+    def keys(self):
+        """
+        Method that returns a generator of the keys within the hash map in any key order, without
+        copying them into an array.
+        """
+        for index in self._iter_live():
+            yield self._key(index)
+
+    def values(self):
+        """
+        Method that returns a generator of the values within the hash map in any key order, without
+        copying them into an array.
+        """
+        for index in self._iter_live():
+            yield self._value(index)
+
+    def items(self):
+        """
+        Method that returns a generator of tuple key-value pairs within the hash map in any key order,
+        without copying them into an array.
+        """
+        for index in self._iter_live():
+            yield self._key(index), self._value(index)
+
     def __iter__(self):
         """
-        Method that allows hash map iteration on itself.
+        Method that allows hash map iteration over its live entries. Every call starts its own cursor,
+        so iterations over the same map can be nested.
+        """
+        for index in self._iter_live():
+            yield self._entry(index)
+
+
+class RobinHoodHashMap(HashMap):
+    """
+    HashMap that resolves collisions with Robin Hood linear probing instead of quadratic probing.
+
+    An insert that reaches an entry sitting closer to its home slot than the incoming entry swaps
+    the two, which keeps probe lengths bunched around the mean. Lookups stop as soon as they pass
+    the distance the key would have been stored at, and remove uses backward-shift deletion so no
+    tombstones are ever left behind. The public API and the 0.5 load factor rule match HashMap.
+    """
+
+    def _probe(self, key: str, hash_value: int) -> tuple[int, bool]:
+        """
+        Robin Hood probing engine. Returns (index, True) when the key is found, otherwise
+        (index, False) where index is the slot the key would be inserted at.
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        index = hash_value % capacity
+
+        distance = 0
+        while distance < capacity:
+            entry = buckets[index]
+
+            # an empty slot, or an entry closer to home than we are, means the key is absent
+            if entry is None or (index - entry.hash % capacity) % capacity < distance:
+                return index, False
+
+            if entry.hash == hash_value and entry.key == key:
+                return index, True
+
+            # traverse to the next index using linear probing
+            distance += 1
+            index = (index + 1) % capacity
+
+        return -1, False
+
+    def _store(self, index: int, key: str, value: object, hash_value: int) -> None:
+        """
+        Add a key that _probe reported absent, displacing entries from the index it returned.
+        """
+        self._place(HashEntry(key, value, hash_value), index)
+
+    def _place(self, entry: HashEntry, index: int = None) -> None:
+        """
+        Place an entry whose key is known to be absent, starting at index (its home slot by
+        default) and displacing entries that are closer to their own home slots.
+        """
+        buckets = self._buckets
+        capacity = self._capacity
+        if index is None:
+            index = entry.hash % capacity
+        distance = (index - entry.hash % capacity) % capacity
+
+        while True:
+            resident = buckets[index]
+
+            if resident is None:
+                buckets[index] = entry
+                self._size += 1
+                self._modcount += 1
+                return
+
+            # take the slot from a richer entry and carry that one forward instead
+            resident_distance = (index - resident.hash % capacity) % capacity
+            if resident_distance < distance:
+                buckets[index] = entry
+                entry, distance = resident, resident_distance
+
+            distance += 1
+            index = (index + 1) % capacity
+
+    def _delete(self, index: int) -> None:
+        """
+        Remove the entry at index and shift the following displaced entries back by one slot.
         """
-        self._index = 0
-        return self
+        buckets = self._buckets
+        capacity = self._capacity
+        next_index = (index + 1) % capacity
+        entry = buckets[next_index]
+
+        while entry is not None and (next_index - entry.hash % capacity) % capacity > 0:
+            buckets[index] = entry
+            index = next_index
+            next_index = (index + 1) % capacity
+            entry = buckets[next_index]
+
+        buckets[index] = None
+        self._size -= 1
+        self._modcount += 1
+
+    def _probe_length(self, index: int) -> int:
+        """
+        Return how many slots a lookup probes to reach the live entry at index (1 = home slot).
+        """
+        capacity = self._capacity
+        return (index - self._buckets[index].hash % capacity) % capacity + 1
+
+
+class PowerOfTwoHashMap(HashMap):
+    """
+    HashMap whose capacity is always a power of two. The cached hash goes through a mixing step
+    so its low bits depend on all of its bits, the home slot is picked with a bitmask instead of
+    a modulo, and collisions are resolved with triangular probing (home, +1, +3, +6, ...), which
+    visits every slot of a power-of-two table. The public API and 0.5 load factor rule match
+    HashMap.
+    """
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Round a requested capacity up to the next power of two.
+        """
+        return next_power_of_two(capacity)
+
+    def _probe(self, key: str, hash_value: int) -> tuple[int, bool]:
+        """
+        Triangular probing engine, with the same contract as HashMap._probe: (index, True) on a
+        hit, otherwise (first tombstone or empty slot, False).
+        """
+        buckets = self._buckets
+        mask = self._capacity - 1
+        index = mix_hash(hash_value) & mask
+        first_tombstone = -1
+
+        j = 0
+        while j <= mask:
+            entry = buckets[index]
+
+            # never-used slot, the key cannot be further along the sequence
+            if entry is None:
+                if first_tombstone < 0:
+                    return index, False
+                return first_tombstone, False
+
+            # remember the first tombstone so an insert can reuse it
+            if entry.is_tombstone:
+                if first_tombstone < 0:
+                    first_tombstone = index
+
+            elif entry.hash == hash_value and entry.key == key:
+                return index, True
 
-    def __next__(self):
+            # the j-th step moves j slots further, so the offsets are the triangular numbers
+            j += 1
+            index = (index + j) & mask
+
+        return first_tombstone, False
+
+    def _place(self, entry: HashEntry) -> None:
         """
-        Method that returns the next item in the hash map according to where the iterator location is.
+        Place a live entry whose key is known to be absent into the first empty slot of its
+        probe sequence, using the entry's cached hash. Used when rehashing.
         """
-        # raise exception error that terminates loop (exceeds array boundary)
-        if self._index >= self._buckets.length():
-            raise StopIteration
+        buckets = self._buckets
+        mask = self._capacity - 1
+        index = mix_hash(entry.hash) & mask
 
-        # retrieves value at current index
-        item = self._buckets.get_at_index(self._index)
-        self._index += 1
+        j = 0
+        while buckets[index] is not None:
+            j += 1
+            index = (index + j) & mask
 
-        # traverse past empty buckets and tombstones
-        while item is None or item.is_tombstone:
+        buckets[index] = entry
+        self._size += 1
+        self._modcount += 1
 
-            # ends loop if exceeds array boundary
-            if self._index >= self._buckets.length():
-                raise StopIteration
+    def _probe_length(self, index: int) -> int:
+        """
+        Return how many slots a lookup probes to reach the live entry at index (1 = home slot).
+        """
+        mask = self._capacity - 1
+        probe = mix_hash(self._buckets[index].hash) & mask
 
-            # get value at current index and traverse to the next one
-            item = self._buckets.get_at_index(self._index)
-            self._index += 1
+        j = 0
+        while probe != index:
+            j += 1
+            probe = (probe + j) & mask
 
-        return item
+        return j + 1
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -511,3 +1071,20 @@ if __name__ == "__main__":
     # print(m)
     # for item in m:
     #     print('K:', item.key, 'V:', item.value)
+
+    print("\nRobinHoodHashMap - backward shift deletion example 1")
+    print("----------------------------------------------------")
+    # anagrams share a hash_function_1 home slot, so these keys form one cluster that wraps
+    # around the end of the table
+    m = RobinHoodHashMap(23, hash_function_1)
+    keys = ['abc', 'acb', 'bac', 'bca', 'abd', 'cab', 'bad']
+    for key in keys:
+        m.put(key, key.upper())
+    print(m)
+
+    # removing from inside the cluster shifts every later displaced entry back one slot,
+    # leaving no tombstone behind
+    m.remove('acb')
+    print(m)
+    found = all(m.get(key) == key.upper() for key in keys if key != 'acb')
+    print(m.get_size(), m.contains_key('acb'), found)
@@ -0,0 +1,304 @@
+# Description: Open addressing HashMap with an array-backed storage layout.
+#              Instead of a DynamicArray of HashEntry objects, slots are kept
+#              in parallel arrays: an array('q') of cached hashes, a bytearray
+#              of slot states (empty / live / tombstone) and plain lists for
+#              keys and values. No per-entry object is allocated and a probe
+#              reads the state and hash arrays without following a pointer.
+
+from array import array
+
+from a6_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+from hash_map_oa import HashMap
+from stats import records_resizes
+
+# slot states stored in the state bytearray
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+
+# hashes are stored as signed 64-bit ints, so they are reduced to 63 bits first
+_HASH_MASK = (1 << 63) - 1
+
+
+class CompactHashMap(HashMap):
+    """
+    Quadratic probing HashMap with the same public API and load factor rules as
+    hash_map_oa.HashMap, backed by parallel arrays instead of HashEntry objects.
+    """
+
+    def __init__(self, capacity: int, function, tombstone_threshold: float = 0.75,
+                 shrink_threshold: float = 0.125) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing over parallel slot arrays
+        """
+        self._init_bookkeeping(function, tombstone_threshold, shrink_threshold)
+
+        # capacity must be a prime number, at least 3 as in HashMap
+        self._capacity = self._round_capacity(max(capacity, 3))
+        self._allocate(self._capacity)
+
+        self._size = 0
+        self._tombstones = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replace the slot arrays with empty arrays of the given capacity
+        """
+        self._hashes = array('q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            state = self._states[i]
+            slot = None if state == EMPTY else self._entry(i)
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    def _entry(self, index: int) -> HashEntry:
+        """
+        Build a HashEntry view of the slot at index, for printing and iteration
+        """
+        entry = HashEntry(self._keys[index], self._values[index], self._hashes[index])
+        entry.is_tombstone = self._states[index] == TOMBSTONE
+        return entry
+
+    # ------------------------------------------------------------------ #
+
+    def _probe(self, key: str, hash_value: int) -> tuple[int, bool]:
+        """
+        Quadratic probing engine over the slot arrays, with the same contract as
+        HashMap._probe: (index, True) on a hit, otherwise (first tombstone or empty slot, False).
+        """
+        hash_value &= _HASH_MASK
+        states, hashes, keys = self._states, self._hashes, self._keys
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        first_tombstone = -1
+
+        j = 0
+        while j < capacity:
+            state = states[index]
+
+            # never-used slot, the key cannot be further along the sequence
+            if state == EMPTY:
+                if first_tombstone < 0:
+                    return index, False
+                return first_tombstone, False
+
+            # remember the first tombstone so an insert can reuse it
+            if state == TOMBSTONE:
+                if first_tombstone < 0:
+                    first_tombstone = index
+
+            elif hashes[index] == hash_value and keys[index] == key:
+                return index, True
+
+            # traverse to the next index using quadratic probing
+            j += 1
+            index = (initial_index + j ** 2) % capacity
+
+        return first_tombstone, False
+
+    def _store(self, index: int, key: str, value: object, hash_value: int) -> None:
+        """
+        Add a key that _probe reported absent at the index it returned.
+        """
+        # insert key-value pair at the first reusable slot (tombstone or empty)
+        if self._states[index] == TOMBSTONE:
+            self._tombstones -= 1
+        self._states[index] = LIVE
+        self._hashes[index] = hash_value & _HASH_MASK
+        self._keys[index] = key
+        self._values[index] = value
+        self._size += 1
+        self._modcount += 1
+
+    def _value(self, index: int) -> object:
+        """
+        Return the value of the live slot at index.
+        """
+        return self._values[index]
+
+    def _set_value(self, index: int, value: object) -> None:
+        """
+        Replace the value of the live slot at index.
+        """
+        self._values[index] = value
+
+    def _delete(self, index: int) -> None:
+        """
+        Remove the live entry at the given index by marking its slot as a tombstone. The key and
+        value stay in the slot, as they do in a tombstoned HashEntry, until it is reused.
+        """
+        self._states[index] = TOMBSTONE
+        self._size -= 1
+        self._modcount += 1
+        self._tombstones += 1
+
+    def _probe_length(self, index: int) -> int:
+        """
+        Return how many slots a lookup probes to reach the live entry at index (1 = home slot).
+        """
+        capacity = self._capacity
+        initial_index = self._hashes[index] % capacity
+
+        j = 0
+        while (initial_index + j ** 2) % capacity != index:
+            j += 1
+
+        return j + 1
+
+    @records_resizes
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that changes the capacity of the hash table and moves the live slots into new
+        arrays using their cached hashes.
+        """
+        if new_capacity < self._size:
+            return
+
+        new_capacity = self._fit_capacity(new_capacity)
+        old = self._states, self._hashes, self._keys, self._values
+        self._allocate(new_capacity)
+        self._capacity = new_capacity
+        self._tombstones = 0
+        self._modcount += 1
+
+        states, hashes, keys, values = self._states, self._hashes, self._keys, self._values
+        for state, hash_value, key, value in zip(*old):
+            if state != LIVE:
+                continue
+
+            # first empty slot of the probe sequence, keys are known to be distinct
+            initial_index = hash_value % new_capacity
+            index = initial_index
+            j = 0
+            while states[index] != EMPTY:
+                j += 1
+                index = (initial_index + j ** 2) % new_capacity
+
+            states[index] = LIVE
+            hashes[index] = hash_value
+            keys[index] = key
+            values[index] = value
+
+    def _slot_columns(self) -> tuple:
+        """
+        Return the slot arrays themselves as the snapshot columns.
+        """
+        return self._hashes, self._states, self._keys, self._values
+
+    def _restore_slots(self, capacity: int, columns: tuple) -> None:
+        """
+        Adopt snapshot slot arrays of the given capacity.
+        """
+        self._hashes, self._states, self._keys, self._values = columns
+        self._capacity = capacity
+
+    def _live_indices(self) -> list:
+        """
+        Return the indices of the slots holding live entries.
+        """
+        return [index for index, state in enumerate(self._states) if state == LIVE]
+
+    def get(self, key: str) -> object:
+        """
+        Method that returns the value using the key and returns None if the key does not exist within
+        the hash map.
+        """
+        index, found = self._probe(key, self._hash_function(key))
+
+        if found:
+            return self._values[index]
+
+        return None
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Method that returns a dynamic array with the value of each key from an iterable, in order,
+        and None for keys that do not exist within the hash map. The keys are hashed in one pass.
+        """
+        keys = list(keys)
+        values = DynamicArray()
+        slot_values = self._values
+
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            index, found = self._probe(key, hash_value)
+            values.append(slot_values[index] if found else None)
+
+        return values
+
+    def clear(self) -> None:
+        """
+        Method that wipes out the contents in the hash map without changing the capacity.
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._modcount += 1
+        self._tombstones = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Method that returns a dynamic array of tuple key-value pairs within the hash map in any key order.
+        """
+        keys_and_values = DynamicArray()
+
+        for state, key, value in zip(self._states, self._keys, self._values):
+            if state == LIVE:
+                keys_and_values.append((key, value))
+
+        return keys_and_values
+
+    def _iter_live(self):
+        """
+        Generate the indices of the live slots, with the same modification check as
+        HashMap._iter_live.
+        """
+        modcount = self._modcount
+        states = self._states
+
+        for index in range(self._capacity):
+            if states[index] != LIVE:
+                continue
+
+            yield index
+            if self._modcount != modcount:
+                raise RuntimeError("HashMap changed during iteration")
+
+    def _key(self, index: int) -> str:
+        """
+        Return the key of the live slot at index.
+        """
+        return self._keys[index]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nCompact storage - put / get / remove")
+    print("------------------------------------")
+    m = CompactHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    m.remove('str0')
+    print(m.get('str0'), m.get('str1'), m.contains_key('str0'), m.get_tombstone_count())
+
+    print("\nCompact storage - iteration")
+    print("---------------------------")
+    m = CompactHashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -0,0 +1,534 @@
+# Description: Open addressing HashMap stored in a memory-mapped file. The
+#              file holds a fixed-size header, a fixed-width slot array and a
+#              blob region of key / value records. A slot records the cached
+#              hash, the state (empty / live / tombstone) and the offset and
+#              lengths of its record in the blob region. Opening a file maps
+#              it without reading or rehashing anything, lookups unpack slots
+#              straight from the mapped pages, and every put / remove writes
+#              through to the file.
+#
+#              File layout (little-endian):
+#                header  magic, version, slot size, capacity, size, tombstones,
+#                        blob start, blob end, dead blob bytes, hash function
+#                        fingerprint, hash function name
+#                slots   capacity x (hash q, offset Q, key length I,
+#                        value length I, state B, 7 pad bytes)
+#                blob    records of utf-8 key bytes followed by pickled value
+#                        bytes, appended as keys are added or updated
+
+import mmap
+import os
+import pickle
+import struct
+
+from a6_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+from hash_map_oa import HashMap
+from snapshot import check_function, function_fingerprint, function_name
+from stats import records_resizes
+
+# slot states, an all-zero slot is empty so a freshly sized file needs no initialising
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+
+# hashes are stored as signed 64-bit ints, so they are reduced to 63 bits first
+_HASH_MASK = (1 << 63) - 1
+
+_MAGIC = b'HMOAMMAP'
+_VERSION = 2
+
+_HEADER = struct.Struct('<8sIIqqqqqqQ')
+_HEADER_SIZE = 256
+_NAME_OFFSET = _HEADER.size
+_NAME_SIZE = _HEADER_SIZE - _HEADER.size
+
+# byte offsets of the header fields that change as the map runs
+_FIELD = struct.Struct('<q')
+_SIZE_OFFSET, _TOMBSTONES_OFFSET, _BLOB_END_OFFSET, _DEAD_OFFSET = 24, 32, 48, 56
+
+_SLOT = struct.Struct('<qQIIB7x')
+_STATE_OFFSET = 24
+
+# space reserved for the blob region of a new file, and the dead bytes that justify a rewrite
+_INITIAL_BLOB = 1 << 12
+_MIN_COMPACT_BYTES = 1 << 20
+
+
+class MappedHashMap(HashMap):
+    """
+    Quadratic probing HashMap with the same public API and load factor rules as
+    hash_map_oa.HashMap, whose table lives in a memory-mapped file.
+
+    An existing file at path is opened in place and capacity is ignored, otherwise a new file
+    is created. Keys must be strings and values must be picklable. The hash function must give
+    the same hash in every process (hash_function_1 / hash_function_2 do, the built-in hash does
+    not). The file records the name and a fingerprint of the function that built it, and will not
+    open under another one. Values are unpickled on read, so only open files from a trusted
+    source.
+    """
+
+    def __init__(self, path, function, capacity: int = 11, tombstone_threshold: float = 0.75,
+                 shrink_threshold: float = 0.125) -> None:
+        """
+        Open the table stored at path, or create it with the given capacity if the file is missing
+        """
+        # a reopened file is not shrunk below the capacity it was opened with
+        self._init_bookkeeping(function, tombstone_threshold, shrink_threshold)
+        self._path = os.fspath(path)
+
+        if os.path.exists(self._path) and os.path.getsize(self._path) > 0:
+            self._file = open(self._path, 'r+b')
+            self._attach()
+        else:
+            # a name that does not fit the header could never be checked on reopen
+            if len(function_name(function).encode('utf-8')) > _NAME_SIZE:
+                raise ValueError("hash function name " + function_name(function)
+                                 + " is longer than " + str(_NAME_SIZE) + " bytes")
+            self._file = open(self._path, 'w+b')
+            self._format(self._round_capacity(max(capacity, 3)))
+
+    def _format(self, capacity: int) -> None:
+        """
+        Size the file for an empty table of the given capacity and write its header.
+        """
+        blob_start = _HEADER_SIZE + capacity * _SLOT.size
+
+        self._file.truncate(0)
+        self._file.truncate(blob_start + _INITIAL_BLOB)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = capacity
+
+        _HEADER.pack_into(self._map, 0, _MAGIC, _VERSION, _SLOT.size, capacity, 0, 0,
+                          blob_start, blob_start, 0, function_fingerprint(self._hash_function))
+        name = function_name(self._hash_function).encode('utf-8')
+        self._map[_NAME_OFFSET:_NAME_OFFSET + len(name)] = name
+
+    def _attach(self) -> None:
+        """
+        Map an existing file and check that it is a table built with this map's hash function.
+        """
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, slot_size, capacity, *_, fingerprint = _HEADER.unpack_from(self._map, 0)
+
+        if magic != _MAGIC or version != _VERSION or slot_size != _SLOT.size:
+            self.close()
+            raise ValueError(self._path + " is not a MappedHashMap file")
+
+        name = bytes(self._map[_NAME_OFFSET:_HEADER_SIZE]).rstrip(b'\0').decode('utf-8')
+        try:
+            check_function(self._path, self._hash_function, name, fingerprint)
+        except ValueError:
+            self.close()
+            raise
+
+        self._capacity = capacity
+
+    # header fields are read from and written to the mapped header directly
+
+    @property
+    def _size(self) -> int:
+        return _FIELD.unpack_from(self._map, _SIZE_OFFSET)[0]
+
+    @_size.setter
+    def _size(self, value: int) -> None:
+        _FIELD.pack_into(self._map, _SIZE_OFFSET, value)
+
+    @property
+    def _tombstones(self) -> int:
+        return _FIELD.unpack_from(self._map, _TOMBSTONES_OFFSET)[0]
+
+    @_tombstones.setter
+    def _tombstones(self, value: int) -> None:
+        _FIELD.pack_into(self._map, _TOMBSTONES_OFFSET, value)
+
+    def _blob_bounds(self) -> tuple[int, int, int]:
+        """
+        Return (blob start, blob end, dead bytes) of the blob region.
+        """
+        return _HEADER.unpack_from(self._map, 0)[6:9]
+
+    def flush(self) -> None:
+        """
+        Method that makes every write so far durable on disk.
+        """
+        self._map.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Method that unmaps and closes the file. Writes already made stay in the file, but only
+        flush guarantees they survive a crash.
+        """
+        self._map.close()
+        self._file.close()
+
+    def save(self, path) -> None:
+        """
+        Snapshots are not written for a mapped table, whose file already is its saved form. Copy
+        the file after flush instead.
+        """
+        raise TypeError("MappedHashMap is already stored in " + self._path + ", copy it after flush()")
+
+    @classmethod
+    def load(cls, path, function=None, **options) -> "MappedHashMap":
+        """
+        Snapshots are not loaded into a mapped table. Open its file with MappedHashMap(path, function).
+        """
+        raise TypeError("open a MappedHashMap file with MappedHashMap(path, function)")
+
+    @classmethod
+    def with_expected_size(cls, count: int, function, path=None, **options) -> "MappedHashMap":
+        """
+        Method that creates the table at path, which must be given, sized so that count inserts
+        never resize it. An existing file is opened and grown with reserve instead.
+        """
+        if path is None:
+            raise TypeError("MappedHashMap.with_expected_size needs the file path as path=")
+
+        hash_map = cls(path, function, cls._capacity_for(count), **options)
+        hash_map.reserve(count)
+        return hash_map
+
+    def __enter__(self) -> "MappedHashMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as hash_map_oa.HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            slot = None if self._state(i) == EMPTY else self._entry(i)
+            out += str(i) + ': ' + str(slot) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _state(self, index: int) -> int:
+        """
+        Return the state byte of the slot at index.
+        """
+        return self._map[_HEADER_SIZE + index * _SLOT.size + _STATE_OFFSET]
+
+    def _record(self, index: int) -> tuple[bytes, bytes]:
+        """
+        Return the raw key and value bytes of the slot at index.
+        """
+        mm = self._map
+        offset, key_length, value_length = _SLOT.unpack_from(mm, _HEADER_SIZE + index * _SLOT.size)[1:4]
+        return mm[offset:offset + key_length], mm[offset + key_length:offset + key_length + value_length]
+
+    def _append(self, record: bytes) -> int:
+        """
+        Append a record to the blob region, growing the file if needed, and return its offset.
+        """
+        blob_end = _FIELD.unpack_from(self._map, _BLOB_END_OFFSET)[0]
+        needed = blob_end + len(record)
+
+        if needed > len(self._map):
+            self._map.close()
+            self._file.truncate(max(needed, 2 * blob_end))
+            self._map = mmap.mmap(self._file.fileno(), 0)
+
+        self._map[blob_end:needed] = record
+        _FIELD.pack_into(self._map, _BLOB_END_OFFSET, needed)
+        return blob_end
+
+    def _add_dead(self, count: int) -> None:
+        """
+        Count blob bytes that no live slot points at any more.
+        """
+        dead = _FIELD.unpack_from(self._map, _DEAD_OFFSET)[0]
+        _FIELD.pack_into(self._map, _DEAD_OFFSET, dead + count)
+
+    def _write_slot(self, index: int, hash_value: int, key_bytes: bytes, value_bytes: bytes) -> None:
+        """
+        Append a record and point the slot at index to it as a live entry.
+        """
+        offset = self._append(key_bytes + value_bytes)
+        _SLOT.pack_into(self._map, _HEADER_SIZE + index * _SLOT.size,
+                        hash_value & _HASH_MASK, offset, len(key_bytes), len(value_bytes), LIVE)
+
+    def _probe(self, key: str, hash_value: int) -> tuple[int, bool]:
+        """
+        Quadratic probing engine over the mapped slots, with the same contract as
+        HashMap._probe: (index, True) on a hit, otherwise (first tombstone or empty slot, False).
+        """
+        hash_value &= _HASH_MASK
+        mm, unpack, slot_size = self._map, _SLOT.unpack_from, _SLOT.size
+        capacity = self._capacity
+        initial_index = hash_value % capacity
+        index = initial_index
+        first_tombstone = -1
+        key_bytes = None
+
+        j = 0
+        while j < capacity:
+            slot_hash, offset, key_length, _, state = unpack(mm, _HEADER_SIZE + index * slot_size)
+
+            # never-used slot, the key cannot be further along the sequence
+            if state == EMPTY:
+                if first_tombstone < 0:
+                    return index, False
+                return first_tombstone, False
+
+            # remember the first tombstone so an insert can reuse it
+            if state == TOMBSTONE:
+                if first_tombstone < 0:
+                    first_tombstone = index
+
+            # compare the key bytes in place only once the hashes match
+            elif slot_hash == hash_value:
+                if key_bytes is None:
+                    key_bytes = key.encode('utf-8', 'surrogatepass')
+                if key_length == len(key_bytes) and mm[offset:offset + key_length] == key_bytes:
+                    return index, True
+
+            # traverse to the next index using quadratic probing
+            j += 1
+            index = (initial_index + j ** 2) % capacity
+
+        return first_tombstone, False
+
+    def _make_room(self) -> bool:
+        """
+        Resize ahead of one more insert as HashMap does, and also rewrite the file once more than
+        half of the blob region is records that were removed or replaced.
+        """
+        if super()._make_room():
+            return True
+
+        blob_start, blob_end, dead = self._blob_bounds()
+        if dead >= _MIN_COMPACT_BYTES and 2 * dead > blob_end - blob_start:
+            self.resize_table(self._capacity)
+            return True
+
+        return False
+
+    def _store(self, index: int, key: str, value: object, hash_value: int) -> None:
+        """
+        Add a key that _probe reported absent at the index it returned.
+        """
+        if self._state(index) == TOMBSTONE:
+            self._tombstones -= 1
+
+        self._write_slot(index, hash_value, key.encode('utf-8', 'surrogatepass'), pickle.dumps(value))
+        self._size += 1
+        self._modcount += 1
+
+    def _key(self, index: int) -> str:
+        """
+        Return the key of the live slot at index.
+        """
+        return self._record(index)[0].decode('utf-8', 'surrogatepass')
+
+    def _value(self, index: int) -> object:
+        """
+        Return the value of the live slot at index.
+        """
+        return pickle.loads(self._record(index)[1])
+
+    def _set_value(self, index: int, value: object) -> None:
+        """
+        Replace the value of the live slot at index. A value that fits in the old one's space is
+        written over it, a longer one is appended with a copy of the key.
+        """
+        mm = self._map
+        position = _HEADER_SIZE + index * _SLOT.size
+        slot_hash, offset, key_length, value_length, _ = _SLOT.unpack_from(mm, position)
+        value_bytes = pickle.dumps(value)
+
+        if len(value_bytes) <= value_length:
+            start = offset + key_length
+            mm[start:start + len(value_bytes)] = value_bytes
+            _SLOT.pack_into(mm, position, slot_hash, offset, key_length, len(value_bytes), LIVE)
+            self._add_dead(value_length - len(value_bytes))
+            return
+
+        key_bytes = mm[offset:offset + key_length]
+        self._write_slot(index, slot_hash, key_bytes, value_bytes)
+        self._add_dead(key_length + value_length)
+
+    def _entry(self, index: int) -> HashEntry:
+        """
+        Build a HashEntry view of the slot at index, for printing and iteration
+        """
+        slot = _SLOT.unpack_from(self._map, _HEADER_SIZE + index * _SLOT.size)
+        slot_hash, state = slot[0], slot[4]
+
+        entry = HashEntry(self._key(index), self._value(index), slot_hash)
+        entry.is_tombstone = state == TOMBSTONE
+        return entry
+
+    def _delete(self, index: int) -> None:
+        """
+        Remove the live entry at the given index by marking its slot as a tombstone.
+        """
+        position = _HEADER_SIZE + index * _SLOT.size
+        key_length, value_length = _SLOT.unpack_from(self._map, position)[2:4]
+
+        self._map[position + _STATE_OFFSET] = TOMBSTONE
+        self._add_dead(key_length + value_length)
+        self._size -= 1
+        self._modcount += 1
+        self._tombstones += 1
+
+    def _probe_length(self, index: int) -> int:
+        """
+        Return how many slots a lookup probes to reach the live entry at index (1 = home slot).
+        """
+        capacity = self._capacity
+        initial_index = _SLOT.unpack_from(self._map, _HEADER_SIZE + index * _SLOT.size)[0] % capacity
+
+        j = 0
+        while (initial_index + j ** 2) % capacity != index:
+            j += 1
+
+        return j + 1
+
+    @records_resizes
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Method that changes the capacity of the hash table. The live records are copied, without
+        decoding them, into a new file that then atomically replaces the old one, so the rewrite
+        also drops dead blob bytes and tombstones.
+        """
+        if new_capacity < self._size:
+            return
+
+        new_capacity = self._fit_capacity(new_capacity)
+        temporary_path = self._path + '.resize'
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+        new_map = MappedHashMap(temporary_path, self._hash_function, new_capacity,
+                                self._tombstone_threshold, self._shrink_threshold)
+        new_capacity = new_map._capacity
+        unpack, slot_size, mm = _SLOT.unpack_from, _SLOT.size, self._map
+
+        for index in self._live_indices():
+            hash_value = unpack(mm, _HEADER_SIZE + index * slot_size)[0]
+
+            # first empty slot of the probe sequence, keys are known to be distinct
+            initial_index = hash_value % new_capacity
+            new_index = initial_index
+            j = 0
+            while new_map._state(new_index) != EMPTY:
+                j += 1
+                new_index = (initial_index + j ** 2) % new_capacity
+
+            new_map._write_slot(new_index, hash_value, *self._record(index))
+
+        new_map._size = self._size
+        new_map.flush()
+        new_map.close()
+
+        self.close()
+        os.replace(temporary_path, self._path)
+        self._file = open(self._path, 'r+b')
+        self._attach()
+        self._modcount += 1
+
+    def _live_indices(self) -> list:
+        """
+        Return the indices of the slots holding live entries.
+        """
+        state = self._state
+        return [index for index in range(self._capacity) if state(index) == LIVE]
+
+    def _iter_live(self):
+        """
+        Generate the indices of the live slots, with the same modification check as
+        HashMap._iter_live.
+        """
+        modcount = self._modcount
+
+        for index in range(self._capacity):
+            if self._state(index) != LIVE:
+                continue
+
+            yield index
+            if self._modcount != modcount:
+                raise RuntimeError("HashMap changed during iteration")
+
+    def get(self, key: str) -> object:
+        """
+        Method that returns the value using the key and returns None if the key does not exist within
+        the hash map.
+        """
+        index, found = self._probe(key, self._hash_function(key))
+
+        if found:
+            return self._value(index)
+
+        return None
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Method that returns a dynamic array with the value of each key from an iterable, in order,
+        and None for keys that do not exist within the hash map. The keys are hashed in one pass.
+        """
+        keys = list(keys)
+        values = DynamicArray()
+
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            index, found = self._probe(key, hash_value)
+            values.append(self._value(index) if found else None)
+
+        return values
+
+    def clear(self) -> None:
+        """
+        Method that wipes out the contents in the hash map without changing the capacity.
+        """
+        self._map.close()
+        self._format(self._capacity)
+        self._modcount += 1
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'table.hmap')
+
+    print("\nMapped storage - put / get / remove")
+    print("-----------------------------------")
+    with MappedHashMap(path, hash_function_1, 53) as m:
+        for i in range(150):
+            m.put('str' + str(i), i * 100)
+            if i % 25 == 24:
+                print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+        m.remove('str0')
+        m.put('str1', {'updated': True})
+        print(m.get('str0'), m.get('str1'), m.contains_key('str0'), m.get_tombstone_count())
+        m.flush()
+
+    print("\nMapped storage - reopen without rebuilding")
+    print("------------------------------------------")
+    with MappedHashMap(path, hash_function_1) as m:
+        print(m.get_size(), m.get_capacity(), m.get('str1'), m.get('str149'), m.get_tombstone_count())
+
+    try:
+        MappedHashMap(path, hash_function_2)
+    except ValueError as error:
+        print(type(error).__name__)
+
+    print("\nMapped storage - iteration")
+    print("--------------------------")
+    os.remove(path)
+    with MappedHashMap(path, hash_function_2, 10) as m:
+        for i in range(5):
+            m.put(str(i), str(i * 24))
+        m.remove('0')
+        m.remove('4')
+        print(m)
+        for item in m:
+            print('K:', item.key, 'V:', item.value)
+
+    os.remove(path)
+    os.rmdir(directory)
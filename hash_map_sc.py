@@ -6,35 +6,85 @@
 # Description: Implement methods within the HashMap class that integrates
 #               proper separate chaining techniques.
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import wraps
 
 from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+                        batch_hash_function, hash_function_1, hash_function_2)
+from capacity import is_prime, mix_hash, next_power_of_two, next_prime
+from resize_policy import ResizePolicy
+from snapshot import paused_gc, read_snapshot, write_snapshot
+from stats import HashMapStats, records_resizes, report
 
 
-class HashMap:
+class HashMap(ResizePolicy):
+
+    # put grows the table once the load factor reaches 1.0
+    _GROW_LOAD = 1.0
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 rehash_step: int = 0,
+                 shrink_threshold: float = 0.25,
+                 self_organizing: str = None) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
         DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        rehash_step > 0 turns on incremental resizing: when put grows the table, the old and new
+        bucket arrays live side by side and every put/get/contains_key/remove moves rehash_step
+        old buckets across, instead of one put rehashing everything at once.
+
+        shrink_threshold is the load factor at or below which remove halves the table, never
+        going under the floor described in resize_policy. It must stay under half the 1.0
+        growth point so a halved table is not grown straight back, and 0.0 turns shrinking off.
+
+        self_organizing reorders chains so that frequently looked up keys are compared first: a key
+        found by get, contains_key or the upsert methods is moved to the front of its bucket with
+        'move_to_front', or one place forward with 'transpose'. Running keys() / values() / items()
+        iterators are not disturbed by the reordering.
         """
+        if self_organizing not in (None, 'move_to_front', 'transpose'):
+            raise ValueError("self_organizing must be None, 'move_to_front' or 'transpose'")
+
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a prime number, at least 3 as the assignment's next prime never gives 2
+        self._capacity = self._round_capacity(max(capacity, 3))
         for _ in range(self._capacity):
             self._buckets.append(LinkedList())
 
         self._hash_function = function
         self._size = 0
 
+        # incremental resize state, _old_buckets is None when no resize is in progress
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._rehash_index = 0
+        self._fill_index = 0
+
+        # remove shrinks the table back towards the capacity it was created with
+        self._init_resize_policy(shrink_threshold)
+
+        # lookups reorder chains unless this is None
+        self._self_organizing = self_organizing
+
+        # bumped by every insert, removal, resize and clear so iterators can detect them
+        self._modcount = 0
+
+        # resize telemetry, None unless enable_stats() was called
+        self._stats = None
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
         DO NOT CHANGE THIS METHOD IN ANY WAY
         """
+        self._finish_rehash()
         out = ''
         for i in range(self._buckets.length()):
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
@@ -44,34 +94,29 @@ class HashMap:
         """
         Increment from given number and the find the closest prime number
         DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
 
-        return capacity
+        Delegates to capacity.next_prime.
+        """
+        return next_prime(capacity)
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
         DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+        Delegates to capacity.is_prime.
+        """
+        return is_prime(capacity)
 
-        return True
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Round a requested capacity up to one the table can use, here a prime. Every capacity the
+        map picks goes through this method, so a subclass with another capacity rule overrides it.
+        """
+        if self._is_prime(capacity):
+            return capacity
+        return self._next_prime(capacity)
 
     def get_size(self) -> int:
         """
@@ -89,6 +134,13 @@ class HashMap:
 
     # ------------------------------------------------------------------ #
 
+    def _hash_many(self, keys: list) -> list:
+        """
+        Hash a list of keys with the map's hash function in one pass, using the vectorized
+        batch version of hash_function_1 / hash_function_2 when available. Used for bulk loads.
+        """
+        return batch_hash_function(self._hash_function)(keys)
+
     def put(self, key: str, value: object) -> None:
         """
         Method that updates the key-value pair in a hash map and any existing keys given will have their
@@ -102,7 +154,12 @@ class HashMap:
 
         if load_factor >= 1.0:
             double_capacity = self.get_capacity() * 2
-            self.resize_table(double_capacity)
+
+            # incremental mode moves the entries across over the following calls
+            self._auto_resize(double_capacity, self._start_rehash if self._rehash_step else None)
+
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
 
         # get hash value and its' index
         hash_value = self._hash_function(key)
@@ -111,21 +168,148 @@ class HashMap:
         # find the bucket (dynamic array) corresponding to the hash value
         bucket = self._buckets.get_at_index(index)
 
-        # existing key -- replace value with new value
+        # buckets of a table that is still being filled in are allocated on first use
+        if bucket is None:
+            bucket = LinkedList()
+            self._buckets.set_at_index(index, bucket)
+
+        # existing key -- replace value with new value in place
         for item in bucket:
-            if item.key == key:
-                bucket.remove(key)
-                bucket.insert(key, value)
+            if item.hash == hash_value and item.key == key:
+                item.value = value
                 return
 
+        # the key may still be waiting in the old table, update it there
+        if self._old_buckets is not None:
+            old_bucket = self._old_bucket(hash_value)
+            if old_bucket is not None:
+                for item in old_bucket:
+                    if item.hash == hash_value and item.key == key:
+                        item.value = value
+                        return
+
         # key does not exist, add key-value pair into hash map
-        bucket.insert(key, value)
+        bucket.insert(key, value, hash_value)
         self._size += 1
+        self._modcount += 1
+
+    @records_resizes
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Begin an incremental resize. The current buckets become the old table and a new table of
+        new_capacity (rounded by _round_capacity) takes their place with every bucket unallocated, so
+        starting the resize does not build any linked lists.
+        """
+        self._finish_rehash()
+        new_capacity = self._round_capacity(new_capacity)
+
+        self._old_buckets, self._old_capacity = self._buckets, self._capacity
+        self._rehash_index = 0
+        self._fill_index = 0
+
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._capacity = new_capacity
+        self._modcount += 1
+
+    def _migrate(self, count: int) -> None:
+        """
+        Move up to count buckets from the old table into the new one, and allocate the same share
+        of the new table's remaining buckets. Ends the resize once the old table is drained.
+        """
+        old_buckets, old_capacity = self._old_buckets, self._old_capacity
+        buckets, capacity = self._buckets, self._capacity
+        end = min(self._rehash_index + count, old_capacity)
+
+        # allocate new buckets at the pace the old ones are drained
+        fill_end = min(capacity, -(-end * capacity // old_capacity))
+        for index in range(self._fill_index, fill_end):
+            if buckets[index] is None:
+                buckets[index] = LinkedList()
+        self._fill_index = max(self._fill_index, fill_end)
+
+        # relink the nodes of each old bucket using their cached hashes, then drop the old bucket
+        # so the old table is freed a few buckets at a time rather than all at once at the end
+        for index in range(self._rehash_index, end):
+            node = old_buckets[index].detach()
+            while node is not None:
+                following = node.next
+                new_index = node.hash % capacity
+                bucket = buckets[new_index]
+                if bucket is None:
+                    bucket = LinkedList()
+                    buckets[new_index] = bucket
+                bucket.insert_node(node)
+                node = following
+            old_buckets[index] = None
+
+        self._rehash_index = end
+        if end >= old_capacity:
+            self._old_buckets = None
+
+    def _finish_rehash(self) -> None:
+        """
+        Complete an incremental resize in progress, if any.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def _old_bucket(self, hash_value: int) -> LinkedList:
+        """
+        Return the old table's bucket for a hash during an incremental resize, or None if that
+        bucket has already been moved across.
+        """
+        index = hash_value % self._old_capacity
+        if index < self._rehash_index:
+            return None
+        return self._old_buckets[index]
+
+    def _find_node(self, key: str, hash_value: int):
+        """
+        Return the node holding key, or None. During an incremental resize the old table is
+        searched too.
+        """
+        if self._self_organizing is not None:
+            return self._promote_node(key, hash_value)
+
+        bucket = self._buckets.get_at_index(hash_value % self._capacity)
+
+        if bucket is not None:
+            for item in bucket:
+                if item.hash == hash_value and item.key == key:
+                    return item
+
+        if self._old_buckets is not None:
+            bucket = self._old_bucket(hash_value)
+            if bucket is not None:
+                for item in bucket:
+                    if item.hash == hash_value and item.key == key:
+                        return item
+
+        return None
+
+    def _promote_node(self, key: str, hash_value: int):
+        """
+        _find_node for a self-organizing map: the node found is moved ahead in its bucket.
+        """
+        transpose = self._self_organizing == 'transpose'
+        buckets = [self._buckets.get_at_index(hash_value % self._capacity)]
+        if self._old_buckets is not None:
+            buckets.append(self._old_bucket(hash_value))
+
+        for bucket in buckets:
+            if bucket is not None:
+                node = bucket.promote(key, hash_value, transpose)
+                if node is not None:
+                    return node
+
+        return None
 
     def empty_buckets(self) -> int:
         """
         Method that simply returns how many empty buckets exist within the hash table.
         """
+        self._finish_rehash()
+
         # buckets are slots inside the hash table
         buckets = 0
 
@@ -146,6 +330,7 @@ class HashMap:
         """
         Method that wipes out the contents in the hash map without changing the capacity.
         """
+        self._old_buckets = None
         self._buckets = DynamicArray()
 
         # set new linked lists to each bucket
@@ -153,7 +338,9 @@ class HashMap:
             self._buckets.append(LinkedList())
 
         self._size = 0
+        self._modcount += 1
 
+    @records_resizes
     def resize_table(self, new_capacity: int) -> None:
         """
         Method that changes the capacity of the hash table and rehashes existing key-value pairs into
@@ -163,42 +350,46 @@ class HashMap:
         if new_capacity < 1:
             return
 
-        # not prime, change to next highest prime number
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        self._finish_rehash()
 
-        # set new hash map with new capacity
-        new_hash_map = HashMap(new_capacity, self._hash_function)
+        # not a usable capacity, round up to the next one (the next prime for this class)
+        new_capacity = self._round_capacity(new_capacity)
 
-        if new_capacity == 2:
-            new_hash_map._capacity = 2
+        # keep doubling until the entries fit under the 1.0 load factor, as put would
+        while self._size > 0 and (self._size - 1) / new_capacity >= 1.0:
+            new_capacity = self._round_capacity(new_capacity * 2)
 
-        # rehash key-value pairs from the inner contents of old map
-        for num in range(self._capacity):
-            bucket = self._buckets[num]
+        # detach every chain, then reuse the emptied lists as the first buckets of the new table
+        old_buckets, old_capacity = self._buckets, self._capacity
+        chains = [old_buckets[num].detach() for num in range(old_capacity)]
+        buckets = [old_buckets[num] for num in range(min(old_capacity, new_capacity))]
+        buckets.extend(LinkedList() for _ in range(new_capacity - len(buckets)))
 
-            for items in bucket:
-                new_hash_map.put(items.key, items.value)
+        # relink the existing nodes into their new buckets using the cached hashes, so a resize
+        # allocates no nodes and only the lists a larger table needs on top of the old ones
+        for node in chains:
+            while node is not None:
+                following = node.next
+                buckets[node.hash % new_capacity].insert_node(node)
+                node = following
 
         # update new values of new hash map
-        self._buckets, self._capacity = new_hash_map._buckets, new_hash_map._capacity
+        self._buckets, self._capacity = DynamicArray(buckets), new_capacity
+        self._modcount += 1
 
     def get(self, key: str):
         """
         Method that returns the value using the key and returns None if the key does not exist within
         the hash map.
         """
-        # get the hash using key
-        hash_value = self._hash_function(key)
-        index = hash_value % self.get_capacity()
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
 
-        # get the bucket (dynamic array) corresponding to the hash value
-        bucket = self._buckets.get_at_index(index)
+        # find the node holding the key using its hash
+        node = self._find_node(key, self._hash_function(key))
 
-        # traverse through the bucket to find the key
-        for item in bucket:
-            if item.key == key:
-                return item.value
+        if node is not None:
+            return node.value
 
         return None
 
@@ -211,24 +402,20 @@ class HashMap:
         if self._size == 0:
             return False
 
-        # get hash value and its' index
-        hash_value = self._hash_function(key)
-        index = hash_value % self.get_capacity()  # index = hash % array_size
-
-        # find the bucket (dynamic array) corresponding to the hash value
-        bucket = self._buckets.get_at_index(index)
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
 
-        # existing key -- replace value with new value
-        for item in bucket:
-            if item.key == key:
-                return True
-
-        return False
+        return self._find_node(key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
         Method that simply removes the given key-value pair from the hash map.
+
+        The table is halved once the load factor drops to the shrink threshold.
         """
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
+
         # get hash value and its' index
         hash_value = self._hash_function(key)
         index = hash_value % self.get_capacity()  # index = hash % array_size
@@ -237,20 +424,203 @@ class HashMap:
         bucket = self._buckets.get_at_index(index)
 
         # existing key -- remove
-        for item in bucket:
-            if item.key == key:
-                bucket.remove(key)
+        if bucket is not None:
+            for item in bucket:
+                if item.hash == hash_value and item.key == key:
+                    bucket.remove(key)
+                    self._size -= 1
+                    self._modcount += 1
+
+        # the key may still be waiting in the old table
+        if self._old_buckets is not None:
+            old_bucket = self._old_bucket(hash_value)
+            if old_bucket is not None and old_bucket.remove(key):
                 self._size -= 1
+                self._modcount += 1
 
         # sets size back to 0 if it goes to negative
         if self._size < 0:
             self._size = 0
 
+        self._release_room()
+
+    def _locate(self, key: str) -> tuple:
+        """
+        Hash a key once and return (node holding the key or None, hash) for the upsert methods.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._rehash_step)
+
+        hash_value = self._hash_function(key)
+        return self._find_node(key, hash_value), hash_value
+
+    def _add(self, key: str, value: object, hash_value: int) -> None:
+        """
+        Add a key that is known to be absent from both tables, growing the table first as put does.
+        """
+        if self.table_load() >= 1.0:
+            double_capacity = self._capacity * 2
+
+            self._auto_resize(double_capacity, self._start_rehash if self._rehash_step else None)
+
+        index = hash_value % self._capacity
+        bucket = self._buckets.get_at_index(index)
+
+        # buckets of a table that is still being filled in are allocated on first use
+        if bucket is None:
+            bucket = LinkedList()
+            self._buckets.set_at_index(index, bucket)
+
+        bucket.insert(key, value, hash_value)
+        self._size += 1
+        self._modcount += 1
+
+    def update_with(self, key: str, function, default: object = None) -> object:
+        """
+        Method that replaces the value of a key with function(value) and returns the new value. A key
+        that does not exist is added with the value function(default). The key is hashed and searched once.
+        """
+        node, hash_value = self._locate(key)
+
+        if node is not None:
+            node.value = function(node.value)
+            return node.value
+
+        value = function(default)
+        self._add(key, value, hash_value)
+        return value
+
+    def increment(self, key: str, delta: int = 1) -> int:
+        """
+        Method that adds delta to the value of a key and returns the new value. A key that does not
+        exist is added with the value delta. The key is hashed and searched once.
+        """
+        node, hash_value = self._locate(key)
+
+        if node is not None:
+            node.value += delta
+            return node.value
+
+        self._add(key, delta, hash_value)
+        return delta
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Method that returns the value of a key, first adding the key with the value default if it
+        does not exist. The key is hashed and searched once.
+        """
+        node, hash_value = self._locate(key)
+
+        if node is not None:
+            return node.value
+
+        self._add(key, default, hash_value)
+        return default
+
+    def put_many(self, pairs) -> None:
+        """
+        Method that puts every (key, value) pair from an iterable into the hash map. The whole batch
+        is hashed in one pass and the table is resized at most once, up front, so that no insert in
+        the batch crosses the 1.0 load factor. Later pairs win over earlier pairs with the same key.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return
+
+        self._finish_rehash()
+
+        # size the table for the largest possible final size
+        needed = self._size + len(pairs)
+        if needed > self._capacity:
+            self._auto_resize(needed)
+
+        hashes = self._hash_many([pair[0] for pair in pairs])
+        buckets, capacity = self._buckets, self._capacity
+
+        for (key, value), hash_value in zip(pairs, hashes):
+            bucket = buckets[hash_value % capacity]
+
+            # existing key -- replace value with new value
+            for item in bucket:
+                if item.hash == hash_value and item.key == key:
+                    item.value = value
+                    break
+
+            # key does not exist, add key-value pair into hash map
+            else:
+                bucket.insert(key, value, hash_value)
+                self._size += 1
+                self._modcount += 1
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Method that returns a dynamic array with the value of each key from an iterable, in order,
+        and None for keys that do not exist within the hash map. The keys are hashed in one pass.
+        """
+        keys = list(keys)
+        values = DynamicArray()
+        self._finish_rehash()
+        buckets, capacity = self._buckets, self._capacity
+
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            value = None
+            for item in buckets[hash_value % capacity]:
+                if item.hash == hash_value and item.key == key:
+                    value = item.value
+                    break
+            values.append(value)
+
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        Method that removes every key from an iterable out of the hash map. Keys that do not exist are
+        ignored. The keys are hashed in one pass.
+        """
+        keys = list(keys)
+        self._finish_rehash()
+        buckets, capacity = self._buckets, self._capacity
+
+        for key, hash_value in zip(keys, self._hash_many(keys)):
+            if buckets[hash_value % capacity].remove(key):
+                self._size -= 1
+                self._modcount += 1
+
+        # shrink once for the whole batch
+        self._release_room()
+
+    def enable_stats(self) -> None:
+        """
+        Method that starts recording resize count and time for get_stats. An incremental resize
+        counts the call that starts it, the per-call migration steps are not timed.
+        """
+        if self._stats is None:
+            self._stats = HashMapStats()
+
+    def disable_stats(self) -> None:
+        """
+        Method that stops recording resize telemetry and discards what was recorded.
+        """
+        self._stats = None
+
+    def get_stats(self) -> dict:
+        """
+        Method that returns a dictionary of statistics: a histogram of chain lengths over all buckets,
+        the longest chain, resize count and cumulative seconds (None unless stats are enabled), the
+        tombstone count (always 0 for separate chaining) and the collision rate, the fraction of
+        entries that share their bucket with an earlier entry.
+        """
+        self._finish_rehash()
+        lengths = [self._buckets[num].length() for num in range(self._capacity)]
+        used = sum(1 for length in lengths if length)
+        return report('chain', lengths, self._size, self._capacity, 0, self._size - used, self._stats)
+
     def get_keys_and_values(self) -> DynamicArray:
         """
         Method that returns a dynamic array of indexes of tuple key-value pairs within the hash map
         in any key order.
         """
+        self._finish_rehash()
         keys_and_values = DynamicArray()
 
         # traverse through hash map and get the bucket
@@ -263,6 +633,124 @@ class HashMap:
                     keys_and_values.append((item.key, item.value))
 
         return keys_and_values
+
+    def save(self, path) -> None:
+        """
+        Method that writes the hash map to a binary snapshot file. Every chain is stored in order
+        with its nodes' cached hashes, so load restores the same layout without hashing any key.
+        """
+        self._finish_rehash()
+        bucket_indices, hashes, keys, values = [], [], [], []
+
+        for index in range(self._capacity):
+            for node in self._buckets[index]:
+                bucket_indices.append(index)
+                hashes.append(node.hash)
+                keys.append(node.key)
+                values.append(node.value)
+
+        write_snapshot(path, type(self), self._hash_function, self._capacity, self._size, 0,
+                       (bucket_indices, hashes, keys, values))
+
+    @classmethod
+    def load(cls, path, function=None, **options) -> "HashMap":
+        """
+        Method that returns a hash map restored from a snapshot written by save, with no hashing
+        and no resizing. The hash function is imported by the name recorded in the file unless
+        one is given. Other keyword arguments are passed to the constructor.
+        """
+        with paused_gc():
+            function, capacity, size, _, columns = read_snapshot(path, cls, function)
+            bucket_indices, hashes, keys, values = columns
+            buckets = [LinkedList() for _ in range(capacity)]
+
+            # nodes are inserted at the head, so insert back to front to keep each chain's order
+            for index, key, value, hash_value in zip(reversed(bucket_indices), reversed(keys),
+                                                     reversed(values), reversed(hashes)):
+                buckets[index].insert(key, value, hash_value)
+
+            hash_map = cls(1, function, **options)
+            hash_map._buckets, hash_map._capacity = DynamicArray(buckets), capacity
+            hash_map._size = size
+
+        return hash_map
+
+    def _iter_nodes(self):
+        """
+        Generate the nodes of every bucket. Raises RuntimeError if the map has a key inserted or
+        removed, is resized or is cleared while the generator is running.
+        """
+        self._finish_rehash()
+        modcount = self._modcount
+        buckets = self._buckets
+
+        for index in range(self._capacity):
+            # copy the chain first, so lookups that reorder it cannot make the generator skip
+            # a node or yield one twice
+            for node in list(buckets[index]):
+                yield node
+                if self._modcount != modcount:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def keys(self):
+        """
+        Method that returns a generator of the keys within the hash map in any key order, without
+        copying them into an array.
+        """
+        for node in self._iter_nodes():
+            yield node.key
+
+    def values(self):
+        """
+        Method that returns a generator of the values within the hash map in any key order, without
+        copying them into an array.
+        """
+        for node in self._iter_nodes():
+            yield node.value
+
+    def items(self):
+        """
+        Method that returns a generator of tuple key-value pairs within the hash map in any key order,
+        without copying them into an array.
+        """
+        for node in self._iter_nodes():
+            yield node.key, node.value
+
+
+class PowerOfTwoHashMap(HashMap):
+    """
+    Separate chaining HashMap whose capacity is always a power of two. Every hash goes through
+    mix_hash before it is cached, so its low bits depend on all of its bits, and a key's bucket
+    is picked by those low bits alone: hash % capacity with a power-of-two capacity is the
+    bitmask hash & (capacity - 1). The public API and 1.0 load factor rule match HashMap.
+    """
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1, **options) -> None:
+        """
+        Initialize new HashMap that hashes keys with function followed by mix_hash. Other keyword
+        arguments are passed to HashMap.
+        """
+        # the wrapper keeps the name of function, so snapshots still record function itself
+        @wraps(function)
+        def mixed_function(key: str) -> int:
+            return mix_hash(function(key))
+
+        super().__init__(capacity, mixed_function, **options)
+
+    def _round_capacity(self, capacity: int) -> int:
+        """
+        Round a requested capacity up to the next power of two.
+        """
+        return next_power_of_two(capacity)
+
+    def _hash_many(self, keys: list) -> list:
+        """
+        Hash a list of keys with the batch version of the unmixed function, then mix each hash.
+        """
+        hashes = batch_hash_function(self._hash_function.__wrapped__)(keys)
+        return [mix_hash(hash_value) for hash_value in hashes]
+
+
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     """
     Method that takes in a dynamic array that is either sorted or unsorted and returns a tuple of
@@ -270,19 +758,30 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     There can be multiple modes if they are the same frequencies.
     """
     frequency = HashMap()
+    mode = DynamicArray()
     highest_frequency = 0
 
     for index in range(da.length()):
         key = da[index]
+        count = frequency.increment(key)
+
+        # higher frequency found, the earlier modes no longer count
+        if count > highest_frequency:
+            highest_frequency = count
+            mode = DynamicArray()
+
+        # every key reaches each count once, so no key is appended twice
+        if count == highest_frequency:
+            mode.append(key)
 
-        # number exists, increment frequency
-        if frequency.contains_key(key):
-            value = frequency.get(key) + 1
-            frequency.put(key, value)
+    return mode, highest_frequency
 
-        # number doesn't exist, add it into hash map
-        else:
-            frequency.put(key, 1)
+
+def _collect_modes(frequency: HashMap) -> tuple[DynamicArray, int]:
+    """
+    Return a dynamic array of the keys with the highest count in a frequency map, and that count.
+    """
+    highest_frequency = 0
 
     # establish a mode array and key-value pairs from hash map
     mode = DynamicArray()
@@ -307,6 +806,121 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     return mode, highest_frequency
 
 
+def _count_chunk(keys: list) -> DynamicArray:
+    """
+    Worker for find_mode_parallel: count one chunk of keys in a local HashMap and return its
+    (key, count) pairs. Runs in a separate process, so it must stay a module-level function.
+    """
+    frequency = HashMap()
+
+    for key in keys:
+        frequency.increment(key)
+
+    return frequency.get_keys_and_values()
+
+
+def find_mode_parallel(da, workers: int = None, chunks_per_worker: int = 4) -> tuple[DynamicArray, int]:
+    """
+    Method that returns the same (mode dynamic array, frequency) result as find_mode, counting
+    chunks of the input in a pool of worker processes. Each worker builds its own frequency
+    HashMap, then the per-chunk counts are merged into one map. da may be a DynamicArray or any
+    sequence. Modes come back in no particular order, as with find_mode.
+    """
+    if isinstance(da, DynamicArray):
+        items = [da[index] for index in range(da.length())]
+    else:
+        items = list(da)
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, -(-len(items) // (workers * chunks_per_worker)))
+    chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+    # a single worker counts in this process rather than paying for a pool
+    if workers == 1:
+        partial_counts = map(_count_chunk, chunks)
+        return _merge_counts(partial_counts)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge_counts(pool.map(_count_chunk, chunks))
+
+
+def _merge_counts(partial_counts) -> tuple[DynamicArray, int]:
+    """
+    Sum (key, count) dynamic arrays from the workers into one frequency map and return its modes.
+    """
+    frequency = HashMap()
+
+    for pairs in partial_counts:
+        for index in range(pairs.length()):
+            key, count = pairs[index]
+            frequency.increment(key, count)
+
+    return _collect_modes(frequency)
+
+
+def find_mode_streaming(stream, k: int = 1024, verify=None) -> tuple[DynamicArray, int, int]:
+    """
+    Method that finds the mode of any iterable of keys, such as lines from a file, in one pass
+    while keeping at most k counters (Misra-Gries summary). Returns a tuple of a dynamic array of
+    candidate modes, their estimated frequency and an error bound: every reported count is at
+    most error below the true count, and a key that is not a candidate occurs at most error times.
+
+    Since a stream cannot be rewound, an exact check takes a second iterable over the same input
+    as verify. The candidates are then counted exactly, and error is 0 when the result is
+    confirmed to be the true mode.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+
+    counters = HashMap(k + 1)
+    decrements = 0
+
+    for key in stream:
+        count = counters.get(key)
+
+        # tracked key or free counter, count it
+        if count is not None or counters.get_size() < k:
+            counters.put(key, 1 if count is None else count + 1)
+            continue
+
+        # every counter is taken, decrement them all and drop the ones that reach zero
+        decrements += 1
+        pairs = counters.get_keys_and_values()
+        for index in range(pairs.length()):
+            tracked, count = pairs[index]
+            if count == 1:
+                counters.remove(tracked)
+            else:
+                counters.put(tracked, count - 1)
+
+    # candidates are the keys whose upper bound reaches the highest estimated count
+    pairs = counters.get_keys_and_values()
+    highest_frequency = 0
+    for index in range(pairs.length()):
+        highest_frequency = max(highest_frequency, pairs[index][1])
+
+    mode = DynamicArray()
+    candidates = HashMap(k + 1)
+    for index in range(pairs.length()):
+        key, count = pairs[index]
+        if count + decrements >= highest_frequency:
+            mode.append(key)
+            candidates.put(key, 0)
+
+    if verify is None:
+        return mode, highest_frequency, decrements
+
+    # exact second pass over the candidate keys only
+    for key in verify:
+        count = candidates.get(key)
+        if count is not None:
+            candidates.put(key, count + 1)
+
+    mode, highest_frequency = _collect_modes(candidates)
+
+    # an untracked key occurs at most decrements times, so a higher count is the true mode
+    return mode, highest_frequency, 0 if highest_frequency > decrements else decrements
+
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
@@ -490,6 +1104,25 @@ if __name__ == "__main__":
     m.resize_table(2)
     print(m.get_keys_and_values())
 
+    print("\nincremental resize example 1")
+    print("----------------------------")
+    m = HashMap(11, hash_function_1, rehash_step=1)
+    for i in range(11):
+        m.put('key' + str(i), i * 10)
+    print(m.get_size(), m.get_capacity())
+
+    # this put starts the resize, then every call moves one more old bucket across
+    m.put('key11', 110)
+    print(m.get_size(), m.get_capacity(), m._old_buckets is not None)
+    m.put('key1', 15)
+    m.remove('key2')
+    m.remove('key99')
+    print(m.get('key1'), m.get('key2'), m.get('key11'), m.contains_key('key10'), m.contains_key('key2'))
+    print(m.get_size(), m._old_buckets is not None)
+    pairs = m.get_keys_and_values()
+    print(sorted(pairs[i] for i in range(pairs.length())))
+    print(m.get_size(), pairs.length(), m._old_buckets is None)
+
     print("\nPDF - find_mode example 1")
     print("-----------------------------")
     da = DynamicArray(["apple", "apple", "grape", "melon", "peach"])
@@ -508,3 +1141,15 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nfind_mode_parallel example 1")
+    print("-----------------------------")
+    for case in test_cases:
+        mode, frequency = find_mode_parallel(case, workers=2)
+        print(f"Input: {case}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nfind_mode_streaming example 1")
+    print("------------------------------")
+    for case in test_cases:
+        mode, frequency, error = find_mode_streaming(iter(case), k=2, verify=iter(case))
+        print(f"Input: {case}\nMode : {mode}, Frequency: {frequency}, Error: {error}\n")
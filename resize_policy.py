@@ -0,0 +1,115 @@
+# Description: Load factor resize policy shared by both HashMaps. A map grows
+#              its table once the load factor reaches its growth point (0.5
+#              for open addressing, 1.0 for separate chaining) and, with the
+#              shrink policy, halves it again once removals bring the load
+#              factor down to the shrink threshold. The threshold stays under
+#              half the growth point, so a freshly halved table is not grown
+#              straight back. The table never shrinks below a floor: the
+#              capacity the map was created with, or the capacity it was last
+#              given explicitly, through resize_table, shrink_to_fit, reserve
+#              or a snapshot load. reserve and with_expected_size size a table
+#              from the growth point so that a known number of puts never
+#              resizes it.
+
+class ResizePolicy:
+    """
+    Mixin holding the resize policy of a HashMap. The map class sets _GROW_LOAD, calls
+    _init_resize_policy from its constructor and _release_room after removals, and sends the
+    resizes put makes through _auto_resize.
+    """
+
+    # load factor at which put grows the table
+    _GROW_LOAD = 1.0
+
+    def _init_resize_policy(self, shrink_threshold: float) -> None:
+        """
+        Check and store the shrink threshold. 0.0 turns shrinking off.
+        """
+        if not 0.0 <= shrink_threshold < self._GROW_LOAD / 2:
+            raise ValueError("shrink_threshold must be in [0.0, " + str(self._GROW_LOAD / 2) + ")")
+
+        self._shrink_threshold = shrink_threshold
+
+        # the floor is noted from the capacity on the first resize decision, _auto_capacity is
+        # the capacity the last automatic resize left
+        self._min_capacity = 0
+        self._auto_capacity = None
+
+    def _note_floor(self) -> None:
+        """
+        Make the current capacity the shrink floor if no automatic resize produced it, that is,
+        if it was set by the constructor, resize_table, shrink_to_fit or a snapshot load.
+        """
+        if self._capacity != self._auto_capacity:
+            self._min_capacity = self._auto_capacity = self._capacity
+
+    def _auto_resize(self, new_capacity: int, resize=None) -> None:
+        """
+        Grow or shrink the table for the load factor policy, through resize_table or the given
+        resize method, keeping the shrink floor that an explicit resize would otherwise move.
+        """
+        self._note_floor()
+        (resize or self.resize_table)(new_capacity)
+        self._auto_capacity = self._capacity
+
+    def _shrink_capacity(self) -> int:
+        """
+        Return the capacity the shrink policy calls for: the capacity is halved for as long as
+        the load factor at that capacity is at or below the shrink threshold and the half is not
+        under the floor. Returns the current capacity when no shrink is due.
+        """
+        if not self._shrink_threshold:
+            return self._capacity
+
+        self._note_floor()
+        capacity = self._capacity
+        threshold = self._shrink_threshold
+        while capacity // 2 >= self._min_capacity and self._size <= threshold * capacity:
+            capacity //= 2
+
+        return capacity
+
+    def _release_room(self) -> bool:
+        """
+        Shrink the table after removals if the shrink policy calls for it. Returns True if the
+        table was rebuilt.
+        """
+        capacity = self._shrink_capacity()
+        if capacity == self._capacity:
+            return False
+
+        self._auto_resize(capacity)
+        return True
+
+    def shrink_to_fit(self) -> None:
+        """
+        Method that resizes the hash table down to the smallest capacity that holds the current
+        entries under the growth load factor, which also becomes the new shrink floor. An open
+        addressing table drops its tombstones on the way.
+        """
+        self.resize_table(max(self._size, 1))
+
+    @classmethod
+    def _capacity_for(cls, count: int) -> int:
+        """
+        Return the smallest capacity that takes count entries without put resizing: the count-th
+        insert sees count - 1 entries, which must stay under the growth load factor.
+        """
+        return max(int((count - 1) / cls._GROW_LOAD) + 1, 1)
+
+    def reserve(self, count: int) -> None:
+        """
+        Method that grows the hash table, if needed, so that it holds count entries in total without
+        another resize. The reserved capacity also becomes the shrink floor.
+        """
+        capacity = self._capacity_for(count)
+        if capacity > self._capacity:
+            self.resize_table(capacity)
+
+    @classmethod
+    def with_expected_size(cls, count: int, *args, **options):
+        """
+        Method that returns an empty hash map sized so that count inserts never resize it. The
+        other arguments, starting with the hash function, are passed to the constructor.
+        """
+        return cls(cls._capacity_for(count), *args, **options)
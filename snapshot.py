@@ -0,0 +1,145 @@
+# Description: Binary snapshot format shared by both HashMaps' save / load.
+#              A snapshot stores the table layout as it is in memory, so
+#              loading it is a bulk read: no key is hashed and the table is
+#              never resized. The file is a fixed header, the map class and
+#              hash function identities as module:qualname, then one pickle
+#              of the table columns. The header also holds a fingerprint of
+#              the hash function, the digest of its hashes of a few fixed
+#              probe keys, because a name alone cannot tell apart functions
+#              such as two seeded_hash closures with different seeds.
+#
+#              header  magic, version, capacity, size, tombstones,
+#                      class name length, function name length,
+#                      function fingerprint
+#              names   utf-8 class name, utf-8 function name
+#              payload pickled tuple of columns, whose layout is up to the map
+
+import gc
+import hashlib
+import importlib
+import inspect
+import pickle
+import struct
+from contextlib import contextmanager
+
+_MAGIC = b'HMSNAP01'
+_VERSION = 2
+_HEADER = struct.Struct('<8sHqqqHHQ')
+
+# keys every hash function is run on to fingerprint it
+_PROBE_KEYS = ('', 'a', 'key1', 'str0', 'listen', 'silent', 'caf\u00e9', 'HashMap snapshot')
+
+
+def function_name(function) -> str:
+    """
+    Return the module:qualname identity of a function or class.
+    """
+    return function.__module__ + ':' + function.__qualname__
+
+
+def function_fingerprint(function) -> int:
+    """
+    Return a 64-bit fingerprint of what a hash function computes: a digest of its hashes of the
+    fixed probe keys. A functools.wraps wrapper is fingerprinted as the function it wraps, whose
+    identity it also carries.
+    """
+    hashes = ','.join(str(inspect.unwrap(function)(key)) for key in _PROBE_KEYS)
+    return int.from_bytes(hashlib.blake2b(hashes.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def check_function(path, function, recorded_name: str, recorded_fingerprint: int) -> None:
+    """
+    Raise ValueError unless function has the identity and fingerprint recorded for the table
+    stored at path.
+    """
+    if function_name(function) != recorded_name:
+        raise ValueError(str(path) + " was built with hash function " + recorded_name)
+
+    # same name, different hashes: a closure over other state, or a function that changed
+    if function_fingerprint(function) != recorded_fingerprint:
+        raise ValueError(str(path) + " was built with a different " + recorded_name
+                         + " (its hashes do not match)")
+
+
+def resolve_function(name: str):
+    """
+    Import and return the object named by a module:qualname identity. Raises ValueError for
+    objects that cannot be imported by name, such as lambdas and nested functions.
+    """
+    module_name, _, qualname = name.partition(':')
+
+    if not qualname or '<' in qualname:
+        raise ValueError(name + " cannot be imported by name, pass the function explicitly")
+
+    target = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+
+    return target
+
+
+@contextmanager
+def paused_gc():
+    """
+    Pause the cyclic garbage collector while a table is rebuilt from a snapshot. Allocating
+    millions of nodes otherwise sets off repeated full collections, and a restore creates no
+    reference cycles for the collector to find.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def write_snapshot(path, map_class, function, capacity: int, size: int, tombstones: int,
+                   columns: tuple) -> None:
+    """
+    Write a snapshot of a table with the given layout columns to path.
+    """
+    class_bytes = function_name(map_class).encode('utf-8')
+    function_bytes = function_name(function).encode('utf-8')
+
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, capacity, size, tombstones,
+                                len(class_bytes), len(function_bytes),
+                                function_fingerprint(function)))
+        file.write(class_bytes)
+        file.write(function_bytes)
+        pickle.dump(columns, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_snapshot(path, map_class, function=None) -> tuple:
+    """
+    Read a snapshot written by write_snapshot for map_class. Returns (function, capacity, size,
+    tombstones, columns). The hash function is imported from its recorded identity unless one
+    is passed, and must have the recorded identity and fingerprint. Raises ValueError for a file
+    that is not a snapshot of this map class or was built with another hash function. The
+    payload is unpickled, so only load snapshots from a trusted source.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(str(path) + " is not a HashMap snapshot")
+
+        (magic, version, capacity, size, tombstones, class_length, function_length,
+         fingerprint) = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(str(path) + " is not a HashMap snapshot")
+
+        class_name = file.read(class_length).decode('utf-8')
+        recorded_function = file.read(function_length).decode('utf-8')
+
+        # a table laid out by one map class cannot be probed by another
+        if class_name != function_name(map_class):
+            raise ValueError(str(path) + " holds a " + class_name + " snapshot")
+
+        if function is None:
+            function = resolve_function(recorded_function)
+        check_function(path, function, recorded_function, fingerprint)
+
+        columns = pickle.load(file)
+
+    return function, capacity, size, tombstones, columns
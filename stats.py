@@ -0,0 +1,69 @@
+# Description: Opt-in runtime statistics for both HashMaps. Only resize
+#              telemetry is recorded as the map runs, and only while stats
+#              are enabled. Chain / probe length histograms, tombstones and
+#              the collision rate are computed from the table when asked
+#              for, so put / get / remove do no extra work.
+
+import functools
+from time import perf_counter
+
+
+class HashMapStats:
+    """
+    Resize telemetry recorded by a HashMap while stats are enabled
+    """
+
+    def __init__(self) -> None:
+        """Initialize counters at zero."""
+        self.resize_count = 0
+        self.resize_seconds = 0.0
+
+    def record_resize(self, seconds: float) -> None:
+        """Count one resize that took the given wall time."""
+        self.resize_count += 1
+        self.resize_seconds += seconds
+
+
+def records_resizes(resize):
+    """
+    Decorate a map's resize method so each call is counted and timed in the map's _stats,
+    when stats are enabled. Disabled maps pay one attribute check per resize.
+    """
+    @functools.wraps(resize)
+    def wrapper(self, new_capacity: int) -> None:
+        if self._stats is None:
+            return resize(self, new_capacity)
+
+        start = perf_counter()
+        resize(self, new_capacity)
+        self._stats.record_resize(perf_counter() - start)
+
+    return wrapper
+
+
+def length_histogram(lengths) -> dict:
+    """Return {length: number of occurrences}, ordered by length."""
+    histogram = {}
+    for length in lengths:
+        histogram[length] = histogram.get(length, 0) + 1
+    return dict(sorted(histogram.items()))
+
+
+def report(kind: str, lengths: list, size: int, capacity: int, tombstones: int,
+           colliding: int, stats: HashMapStats) -> dict:
+    """
+    Build the dictionary returned by HashMap.get_stats. kind is 'chain' (SC, one length per
+    bucket) or 'probe' (OA, one length per live entry). colliding is the number of entries
+    that did not get a bucket or home slot to themselves.
+    """
+    return {
+        'size': size,
+        'capacity': capacity,
+        'load': size / capacity,
+        kind + '_length_histogram': length_histogram(lengths),
+        'max_' + kind + '_length': max(lengths, default=0),
+        'resize_count': stats.resize_count if stats else None,
+        'resize_seconds': stats.resize_seconds if stats else None,
+        'tombstones': tombstones,
+        'collision_rate': colliding / size if size else 0.0,
+    }